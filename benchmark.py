@@ -0,0 +1,89 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the program to run the benchmarks of the board operations.
+It prints the time of every case, writes the results as JSON and compares them
+against a baseline written by a previous run. It exits with an error when a
+case is slower than the baseline by more than the threshold.
+
+Example: python benchmark.py --output results.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# The render cases draw on surfaces in memory, no window or sound is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.benchmarks import compare, run_benchmarks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the board operations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 64, 128])
+    parser.add_argument("--num-colors", type=int, nargs="+", default=[4, 9, 18])
+    parser.add_argument("--cases", nargs="+", default=None, help="cases to run")
+    parser.add_argument("--no-render", action="store_true", help="skip the render cases")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="seconds to time each case"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="file to write the results to")
+    parser.add_argument("--baseline", type=Path, default=None, help="results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="ratio to the baseline over which a case is a regression",
+    )
+    args = parser.parse_args()
+
+    baseline = (
+        json.loads(args.baseline.read_text())["results"]
+        if args.baseline is not None and args.baseline.exists()
+        else {}
+    )
+
+    def report(key, result):
+        line = f"{key:<40} median {result['median'] * 1000:10.4f} ms"
+        if key in baseline and baseline[key]["median"] > 0:
+            line += f" | x{result['median'] / baseline[key]['median']:.2f} baseline"
+        print(line, flush=True)
+
+    results = run_benchmarks(
+        args.sizes,
+        args.num_colors,
+        cases=args.cases,
+        render=not args.no_render,
+        seed=args.seed,
+        min_time=args.min_time,
+        report=report,
+    )
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps({"seed": args.seed, "results": results}, indent=4) + "\n"
+        )
+        print(f"Results written to {args.output}")
+
+    regressions = [
+        key
+        for key, (_, regression) in compare(results, baseline, args.threshold).items()
+        if regression
+    ]
+    for key in regressions:
+        print(f"Regression: {key}")
+
+    sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,102 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the program to benchmark the frames of the whole game
+without a display. A scripted player goes from the title to the game over and
+back for a fixed number of frames of a fixed duration. It prints the frames
+per second and the time of the frames of each state, writes the results as
+JSON and compares them against a baseline written by a previous run. It exits
+with an error when a state is slower than the baseline by more than the
+threshold.
+
+Example: python benchmark_frames.py --output frames.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# No window or sound is needed, the frames are drawn by the dummy drivers
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from src.benchmarks import compare
+from src.frame_benchmark import run_frame_benchmark
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the frames of the game")
+    parser.add_argument("--frames", type=int, default=6000)
+    parser.add_argument("--dt", type=float, default=1 / 60, help="seconds of game time of a frame")
+    parser.add_argument(
+        "--swap-interval", type=int, default=20, help="frames between the swaps of the player"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--level-time",
+        type=int,
+        default=20,
+        help="seconds of a level, short so the games end in the frames",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="file to write the results to")
+    parser.add_argument("--baseline", type=Path, default=None, help="results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="ratio to the baseline over which a state is a regression",
+    )
+    args = parser.parse_args()
+
+    results = run_frame_benchmark(
+        args.frames, args.dt, args.swap_interval, args.seed, args.level_time
+    )
+
+    baseline = (
+        json.loads(args.baseline.read_text())["results"]
+        if args.baseline is not None and args.baseline.exists()
+        else {}
+    )
+    ratios = compare(results, baseline, args.threshold)
+
+    for state, result in results.items():
+        line = (
+            f"{state:<16} {result['frames']:6d} frames {result['fps']:9.1f} fps"
+            f" | median {result['median'] * 1000:8.4f} ms"
+            f" p95 {result['p95'] * 1000:8.4f} ms max {result['max'] * 1000:8.4f} ms"
+        )
+        if state in ratios:
+            line += f" | x{ratios[state][0]:.2f} baseline"
+        print(line)
+    print(f"Swaps: {results['all']['swaps']}")
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "seed": args.seed,
+                    "frames": args.frames,
+                    "dt": args.dt,
+                    "results": results,
+                },
+                indent=4,
+            )
+            + "\n"
+        )
+        print(f"Results written to {args.output}")
+
+    regressions = [state for state, (_, regression) in ratios.items() if regression]
+    for state in regressions:
+        print(f"Regression: {state}")
+
+    sys.exit(1 if len(regressions) > 0 else 0)
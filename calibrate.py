@@ -0,0 +1,85 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the program to calibrate the difficulty presets. It
+simulates games for every candidate preset, prints the statistics of each one
+and writes the chosen presets to presets.json, which the game loads.
+
+Example: python calibrate.py --games 500 --num-colors 4 6 9 18
+"""
+import argparse
+import json
+from pathlib import Path
+
+from src.calibration import calibrate, choose_presets
+
+BASE_DIR = Path(__file__).parent
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate the difficulty presets")
+    parser.add_argument("--games", type=int, default=200, help="games per candidate")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--goal-score", type=int, nargs="+", default=[1000, 2500, 5000])
+    parser.add_argument("--level-time", type=int, nargs="+", default=[60, 90, 180])
+    parser.add_argument("--num-colors", type=int, nargs="+", default=[4, 9, 18])
+    parser.add_argument("--bot-depth", type=int, default=1)
+    parser.add_argument("--bot-samples", type=int, default=1)
+    parser.add_argument(
+        "--targets",
+        type=float,
+        nargs=3,
+        default=[0.9, 0.6, 0.3],
+        metavar=("EASY", "MEDIUM", "HARD"),
+        help="probability of clearing the first level for each difficulty",
+    )
+    parser.add_argument("--output", type=Path, default=BASE_DIR / "presets.json")
+    parser.add_argument(
+        "--report", type=Path, default=None, help="file to write the statistics to"
+    )
+    args = parser.parse_args()
+
+    summaries = calibrate(
+        args.goal_score,
+        args.level_time,
+        args.num_colors,
+        args.games,
+        workers=args.workers,
+        seed=args.seed,
+        width=args.width,
+        height=args.height,
+        **{"bot-depth": args.bot_depth, "bot-samples": args.bot_samples},
+    )
+
+    for summary in summaries:
+        preset = summary["preset"]
+        rates = summary["score-per-second"]
+        print(
+            f"goal {preset['goal-score']:>6} time {preset['level-time']:>4} "
+            f"colors {preset['num-colors']:>2} | "
+            f"score/s p10 {rates['p10']:8.1f} p50 {rates['p50']:8.1f} "
+            f"p90 {rates['p90']:8.1f} | "
+            f"dead boards {summary['dead-board-rate']:.3f} | "
+            f"clear {summary['level-clear-probability']:.2f}"
+        )
+
+    presets = choose_presets(
+        summaries, dict(zip(("Easy", "Medium", "Hard"), args.targets))
+    )
+    args.output.write_text(json.dumps(presets, indent=4) + "\n")
+    print(f"Presets written to {args.output}")
+
+    if args.report is not None:
+        args.report.write_text(json.dumps(summaries, indent=4) + "\n")
@@ -12,16 +12,47 @@ Author: Lewis Ochoa
 lewis8a@gmail.com
 
 This file contains the main program to run the game.
+
+Example: python main.py --seed 42 --record game.replay
+         python main.py --replay game.replay
+         python main.py --board-width 64 --board-height 64
+         python main.py --profile frames.csv
 """
+import argparse
+from pathlib import Path
+
 import settings
 from src.Match3 import Match3
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match 3")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the game")
+    parser.add_argument("--record", type=Path, default=None, help="file to record the inputs to")
+    parser.add_argument("--replay", type=Path, default=None, help="file of inputs to replay")
+    parser.add_argument("--profile", type=Path, default=None, help="file to write the times of each frame to")
+    parser.add_argument("--board-width", type=int, default=settings.BOARD_WIDTH)
+    parser.add_argument("--board-height", type=int, default=settings.BOARD_HEIGHT)
+    args = parser.parse_args()
+
+    # Boards larger than the viewport are scrolled with the arrow keys
+    settings.BOARD_WIDTH = args.board_width
+    settings.BOARD_HEIGHT = args.board_height
+
     match3 = Match3(
         "Match 3",
         settings.WINDOW_WIDTH,
         settings.WINDOW_HEIGHT,
         settings.VIRTUAL_WIDTH,
         settings.VIRTUAL_HEIGHT,
+        seed=args.seed,
+        record=args.record,
+        replay=args.replay,
+        profile=args.profile,
     )
-    match3.exec()
+    try:
+        match3.exec()
+    finally:
+        # Keeps the records when the game is closed from the window
+        if match3.recorder is not None:
+            match3.recorder.close()
+        settings.PROFILER.close()
@@ -15,12 +15,19 @@ This file contains the game settings that include the association of the
 inputs with an their ids, constants of values to set up the game, sounds,
 textures, frames, and fonts.
 """
+import json
 from pathlib import Path
 
+import random
+
 import pygame
 
 from gale import input_handler
 
+from src.BoardPool import BoardPool
+from src.FrameProfiler import FrameProfiler
+from src.Scheduler import Scheduler
+from src.TextureAtlas import TextureAtlas
 from src.frames_utility import generate_tile_frames
 
 input_handler.InputHandler.set_keyboard_action(input_handler.KEY_ESCAPE, "quit")
@@ -28,6 +35,9 @@ input_handler.InputHandler.set_keyboard_action(input_handler.KEY_KP_ENTER, "ente
 input_handler.InputHandler.set_keyboard_action(input_handler.KEY_RETURN, "enter")
 input_handler.InputHandler.set_keyboard_action(input_handler.KEY_UP, "up")
 input_handler.InputHandler.set_keyboard_action(input_handler.KEY_DOWN, "down")
+input_handler.InputHandler.set_keyboard_action(input_handler.KEY_LEFT, "left")
+input_handler.InputHandler.set_keyboard_action(input_handler.KEY_RIGHT, "right")
+input_handler.InputHandler.set_keyboard_action(input_handler.KEY_F3, "profiler")
 input_handler.InputHandler.set_mouse_click_action(input_handler.MOUSE_BUTTON_1, "click")
 input_handler.InputHandler.set_mouse_click_action(input_handler.MOUSE_BUTTON_3, "click3")
 input_handler.InputHandler.set_mouse_motion_action(input_handler.MOUSE_MOTION_UP, "mouse_motion")
@@ -44,6 +54,10 @@ VIRTUAL_HEIGHT = 288
 BOARD_WIDTH = 8
 BOARD_HEIGHT = 8
 
+# Tiles of the board shown on the screen, larger boards are scrolled
+VIEWPORT_WIDTH = 8
+VIEWPORT_HEIGHT = 8
+
 TILE_SIZE = 32
 
 NUM_VARIETIES = 1
@@ -55,8 +69,14 @@ BACKGROUND_LOOPING_POINT = -1024 + VIRTUAL_WIDTH - 4 + 51
 LEVEL_TIME = 60
 HINT_TIME = 5
 
+# Seconds to search the best move for a hint
+HINT_SEARCH_TIME = 0.05
+
 GOAL_SCORE = 1000
 
+# Minimum number of available moves of a new board
+MIN_MOVES = 1
+
 BASE_DIR = Path(__file__).parent
 
 TEXTURES = {
@@ -66,6 +86,10 @@ TEXTURES = {
 
 FRAMES = {"tiles": generate_tile_frames(TEXTURES["tiles"])}
 
+# The tile frames as subsurfaces and the tiles with their shadows, see
+# TextureAtlas. They are converted to the display format by Match3.init.
+ATLASES = {"tiles": TextureAtlas(TEXTURES["tiles"], FRAMES["tiles"])}
+
 pygame.mixer.init()
 
 SOUNDS = {
@@ -93,8 +117,35 @@ FONTS = {
     "huge": pygame.font.Font(BASE_DIR / "fonts" / "font.ttf", 64),
 }
 
+# Difficulty presets of the settings menu, they can be replaced by the ones
+# written by calibrate.py in presets.json
+DIFFICULTY_PRESETS = {
+    "Easy": {"goal-score": 5000, "level-time": 180, "num-colors": 4},
+    "Medium": {"goal-score": 2500, "level-time": 90, "num-colors": 9},
+    "Hard": {"goal-score": 1000, "level-time": 60, "num-colors": 18},
+}
+
+PRESETS_PATH = BASE_DIR / "presets.json"
+
+if PRESETS_PATH.exists():
+    DIFFICULTY_PRESETS.update(json.loads(PRESETS_PATH.read_text()))
+
 CUSTOM_SETTINGS = {
     "goal-score": GOAL_SCORE,
     "level-time": LEVEL_TIME,
     "num-colors": NUM_COLORS
-}
\ No newline at end of file
+}
+
+# Random stream of the game, seeded to make runs reproducible. Every part of
+# the game takes its randomness from it.
+RNG = random.Random()
+
+# Boards generated in background for the current settings
+BOARD_POOL = BoardPool(rng=random.Random(RNG.getrandbits(64)))
+
+# Times of the frames and the board operations, shown with F3
+PROFILER = FrameProfiler()
+
+# Timers of the game, the ones of a state are grouped by it and cancelled when
+# the state machine leaves it
+SCHEDULER = Scheduler()
@@ -0,0 +1,133 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class BitBoard, the board represented as one integer
+bitmask per color. The cell (i, j) is the bit i * width + j of the masks.
+"""
+from typing import Dict, Iterator, List, Tuple
+
+
+class BitBoard:
+    def __init__(self, width: int, height: int, num_colors: int) -> None:
+        self.width = width
+        self.height = height
+        self.masks: List[int] = [0] * num_colors
+        self.full = (1 << (width * height)) - 1
+
+        # Cells (i, j) such that (i + di, j + dj) is inside the board, for the
+        # offsets used by the shifts.
+        self.__valid: Dict[Tuple[int, int], int] = {}
+        for di in range(-2, 3):
+            rows = 0
+            for i in range(max(0, -di), min(height, height - di)):
+                rows |= ((1 << width) - 1) << (i * width)
+            for dj in range(-2, 3):
+                cols = 0
+                for j in range(max(0, -dj), min(width, width - dj)):
+                    cols |= 1 << j
+                cols_all = 0
+                for i in range(height):
+                    cols_all |= cols << (i * width)
+                self.__valid[(di, dj)] = rows & cols_all
+
+    def copy(self) -> "BitBoard":
+        # The valid masks only depend on the size, so they are shared.
+        bitboard = BitBoard.__new__(BitBoard)
+        bitboard.__dict__.update(self.__dict__)
+        bitboard.masks = list(self.masks)
+        return bitboard
+
+    @staticmethod
+    def positions(mask: int) -> Iterator[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def set(self, p: int, color: int) -> None:
+        self.masks[color] |= 1 << p
+
+    def clear(self, p: int, color: int) -> None:
+        self.masks[color] &= ~(1 << p)
+
+    def at(self, mask: int, di: int, dj: int) -> int:
+        # Bit p of the result is set when the cell p + (di, dj) is in mask.
+        s = di * self.width + dj
+        shifted = mask >> s if s >= 0 else mask << -s
+        return shifted & self.__valid[(di, dj)]
+
+    def runs(self) -> List[List[int]]:
+        # Runs of three or more cells of the same color, as lists of cells.
+        runs: List[List[int]] = []
+        w = self.width
+
+        for m in self.masks:
+            if m == 0:
+                continue
+
+            # Bits where a horizontal or a vertical triple starts
+            h = m & self.at(m, 0, 1) & self.at(m, 0, 2)
+            v = m & self.at(m, 1, 0) & self.at(m, 2, 0)
+
+            if h:
+                current: List[int] = []
+                for p in self.positions(h | (h << 1) | (h << 2)):
+                    if current and p == current[-1] + 1 and p % w != 0:
+                        current.append(p)
+                    else:
+                        current = [p]
+                        runs.append(current)
+
+            if v:
+                columns: Dict[int, List[int]] = {}
+                for p in self.positions(v | (v << w) | (v << 2 * w)):
+                    current = columns.get(p % w)
+                    if current and p == current[-1] + w:
+                        current.append(p)
+                    else:
+                        columns[p % w] = [p]
+                        runs.append(columns[p % w])
+
+        return runs
+
+    def color_moves(self, color: int) -> Tuple[int, int]:
+        # Masks of the swaps that give a match of the color on a full board:
+        # bit p of the first mask is the swap of p with its right neighbor and
+        # bit p of the second mask is the swap of p with its bottom neighbor.
+        m = self.masks[color]
+        at = self.at
+
+        # Cells that complete a line of the color in each axis if it is put
+        # in them, using only the neighbors on one side or both sides.
+        left2 = at(m, 0, -1) & at(m, 0, -2)
+        right2 = at(m, 0, 1) & at(m, 0, 2)
+        up2 = at(m, -1, 0) & at(m, -2, 0)
+        down2 = at(m, 1, 0) & at(m, 2, 0)
+        h_mid = at(m, 0, -1) & at(m, 0, 1)
+        v_mid = at(m, -1, 0) & at(m, 1, 0)
+        h_any = left2 | right2 | h_mid
+        v_any = up2 | down2 | v_mid
+
+        free = self.full & ~m
+
+        # The color enters the cell from its left, right, top or bottom, so
+        # the line through that side must be ignored.
+        from_left = (right2 | v_any) & free
+        from_right = (left2 | v_any) & free
+        from_top = (down2 | h_any) & free
+        from_bottom = (up2 | h_any) & free
+
+        right_moves = (m & at(from_left, 0, 1)) | (from_right & at(m, 0, 1))
+        down_moves = (m & at(from_top, 1, 0)) | (from_bottom & at(m, 1, 0))
+
+        return right_moves, down_moves
@@ -13,227 +13,328 @@ lewis8a@gmail.com
 
 This file contains the class Board.
 """
-from typing import List, Optional, Tuple, Any, Dict, Set
-
-import pygame
+from typing import List, Optional, Set, Tuple, Dict
 
 import random
 
+import pygame
+
 import settings
+from src import solver
+from src.BoardModel import BoardModel, CascadeStep
+from src.HintSearch import HintSearch
 from src.Tile import Tile
+from src.TileTweens import TileTweens
 
 class Board:
-    def __init__(self, x: int, y: int) -> None:
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        model: Optional[BoardModel] = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         self.x = x
         self.y = y
-        self.matches: List[List[Tile]] = []
+        # Random stream of the hint search, apart from the one of the model
+        # so the hints do not change the refills.
+        self.rng = rng if rng is not None else random.Random(settings.RNG.getrandbits(64))
+        self.__hint_search = HintSearch()
+        # The rules of the game live in the model, the board keeps a Tile for
+        # each cell of the model to render and animate it.
+        if model is None:
+            Board.configure_pool()
+            model = settings.BOARD_POOL.take()
+        self.model = model
+        self.model.profiler = settings.PROFILER
         self.tiles: List[List[Tile]] = []
         self.__initialize_tiles()
 
+        # Part of the board shown at (x, y), in pixels. Boards larger than
+        # the viewport are scrolled and only the visible tiles are drawn.
+        self.view_width = (
+            min(model.width, settings.VIEWPORT_WIDTH) * settings.TILE_SIZE
+        )
+        self.view_height = (
+            min(model.height, settings.VIEWPORT_HEIGHT) * settings.TILE_SIZE
+        )
+        self.scroll_x = 0
+        self.scroll_y = 0
+
+        # The tiles at rest are drawn once in a layer of the size of the
+        # viewport. Only the cells that changed are drawn again in it, and the
+        # tiles that move are drawn over it every frame until they come to
+        # rest.
+        self.__layer: Optional[pygame.Surface] = None
+        # None when the whole layer has to be drawn
+        self.__dirty_cells: Optional[Set[Tuple[int, int]]] = None
+        self.__moving: Dict[Tile, None] = {}
+
+        # (sprite, position) of the tiles to draw with a single Surface.blits
+        # call, the list is reused from frame to frame
+        self.__batch: List[Tuple[pygame.Surface, Tuple[float, float]]] = []
+
+        # Tweens of the tiles that fall in the cascades
+        self.falls = TileTweens()
+
+    @staticmethod
+    def configure_pool() -> None:
+        # Makes the pool generate boards for the current settings
+        settings.BOARD_POOL.configure(
+            settings.BOARD_WIDTH,
+            settings.BOARD_HEIGHT,
+            settings.CUSTOM_SETTINGS["num-colors"],
+            settings.NUM_VARIETIES,
+            settings.MIN_MOVES,
+        )
+
     def render(self, surface: pygame.Surface) -> None:
-        for row in self.tiles:
-            for tile in row:
-                tile.render(surface, self.x, self.y)
-
-    def __is_match_generated(self, i: int, j: int, color: int) -> bool:
-        if (
-            i >= 2
-            and self.tiles[i - 1][j].color == color
-            and self.tiles[i - 2][j].color == color
+        self.__update_layer()
+        surface.blit(self.__layer, (self.x, self.y))
+
+        clip = surface.get_clip()
+        surface.set_clip(self.get_viewport())
+
+        offset_x = self.x - self.scroll_x
+        offset_y = self.y - self.scroll_y
+        left, top = self.scroll_x - settings.TILE_SIZE, self.scroll_y - settings.TILE_SIZE
+        right, bottom = self.scroll_x + self.view_width, self.scroll_y + self.view_height
+
+        for tile in list(self.__moving):
+            if self.__at_rest(tile):
+                del self.__moving[tile]
+                self.__mark_dirty((tile.i, tile.j))
+            if left < tile.x < right and top < tile.y < bottom:
+                self.__add_to_batch(tile, offset_x, offset_y)
+
+        self.__draw_batch(surface)
+        surface.set_clip(clip)
+
+    def __add_to_batch(self, tile: Tile, offset_x: int, offset_y: int) -> None:
+        self.__batch.append(
+            (
+                settings.ATLASES["tiles"].sprites[(tile.color, tile.variety)],
+                (tile.x + offset_x, tile.y + offset_y),
+            )
+        )
+
+    def __draw_batch(self, surface: pygame.Surface) -> None:
+        surface.blits(self.__batch, doreturn=False)
+        self.__batch.clear()
+
+    def lift(self, tile: Tile) -> None:
+        # Takes the tile out of the layer because it is going to move
+        if tile not in self.__moving:
+            self.__moving[tile] = None
+            self.__mark_dirty((tile.i, tile.j))
+
+    def __mark_dirty(self, cell: Tuple[int, int]) -> None:
+        if self.__dirty_cells is not None:
+            self.__dirty_cells.add(cell)
+
+    def __at_rest(self, tile: Tile) -> bool:
+        # A tile within half a pixel of its cell is snapped to it
+        x, y = tile.j * settings.TILE_SIZE, tile.i * settings.TILE_SIZE
+        if abs(tile.x - x) >= 0.5 or abs(tile.y - y) >= 0.5:
+            return False
+        if self.tiles[tile.i][tile.j] is not tile:
+            return False
+        tile.x, tile.y = x, y
+        return True
+
+    def __static_tile(self, i: int, j: int) -> Optional[Tile]:
+        if not (0 <= i < self.model.height and 0 <= j < self.model.width):
+            return None
+        tile = self.tiles[i][j]
+        return tile if tile is not None and tile not in self.__moving else None
+
+    def __update_layer(self) -> None:
+        T = settings.TILE_SIZE
+
+        if self.__layer is None:
+            self.__layer = pygame.Surface(
+                (self.view_width + 2, self.view_height + 2), pygame.SRCALPHA
+            )
+
+        i0, j0 = self.scroll_y // T, self.scroll_x // T
+        i1 = (self.scroll_y + self.view_height) // T
+        j1 = (self.scroll_x + self.view_width) // T
+
+        # Drawing the whole layer is cheaper when many cells changed
+        if self.__dirty_cells is None or (
+            len(self.__dirty_cells) > (i1 - i0) * (j1 - j0) // 4
         ):
-            return True
+            self.__layer.fill((0, 0, 0, 0))
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    tile = self.__static_tile(i, j)
+                    if tile is not None:
+                        self.__add_to_batch(tile, -self.scroll_x, -self.scroll_y)
+            self.__draw_batch(self.__layer)
+            self.__dirty_cells = set()
+            return
+
+        # A sprite covers its cell and the shadow goes two pixels into the
+        # next ones, so a cell is drawn again with the neighbors that cover
+        # it, in the same order as a whole redraw.
+        for i, j in self.__dirty_cells:
+            if not (i0 <= i < i1 and j0 <= j < j1):
+                continue
+
+            self.__layer.set_clip(
+                pygame.Rect(j * T - self.scroll_x, i * T - self.scroll_y, T + 2, T + 2)
+            )
+            self.__layer.fill((0, 0, 0, 0))
+
+            for ni in range(max(i0, i - 1), min(i1, i + 2)):
+                for nj in range(max(j0, j - 1), min(j1, j + 2)):
+                    tile = self.__static_tile(ni, nj)
+                    if tile is not None:
+                        self.__add_to_batch(tile, -self.scroll_x, -self.scroll_y)
+            self.__draw_batch(self.__layer)
+
+        self.__layer.set_clip(None)
+        self.__dirty_cells = set()
+
+    def get_viewport(self) -> pygame.Rect:
+        # Area of the screen of the board, with room for the tile shadows
+        return pygame.Rect(self.x, self.y, self.view_width + 2, self.view_height + 2)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        max_x = self.model.width * settings.TILE_SIZE - self.view_width
+        max_y = self.model.height * settings.TILE_SIZE - self.view_height
+        self.scroll_x = max(0, min(max_x, self.scroll_x + dx))
+        self.scroll_y = max(0, min(max_y, self.scroll_y + dy))
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        # Makes the whole layer be drawn again in the next render
+        self.__dirty_cells = None
+
+    def to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        # Screen position of a position in the board, both in pixels
+        return x + self.x - self.scroll_x, y + self.y - self.scroll_y
+
+    def to_board(self, x: int, y: int) -> Tuple[int, int]:
+        # Board position of a position in the screen, both in pixels
+        return x - self.x + self.scroll_x, y - self.y + self.scroll_y
 
+    def is_visible(self, i: int, j: int) -> bool:
+        x, y = j * settings.TILE_SIZE, i * settings.TILE_SIZE
         return (
-            j >= 2
-            and self.tiles[i][j - 1].color == color
-            and self.tiles[i][j - 2].color == color
+            self.scroll_x <= x < self.scroll_x + self.view_width
+            and self.scroll_y <= y < self.scroll_y + self.view_height
         )
 
+    def __new_tile(self, p: int) -> Tile:
+        i, j = divmod(p, self.model.width)
+        tile = Tile(i, j, self.model.colors[p], self.model.varieties[p])
+        tile.type = self.model.powerups[p]
+        tile.powerup = tile.type != 0
+        return tile
+
     def __initialize_tiles(self) -> None:
         self.tiles = [
-            [None for _ in range(settings.BOARD_WIDTH)]
-            for _ in range(settings.BOARD_HEIGHT)
+            [self.__new_tile(i * self.model.width + j) for j in range(self.model.width)]
+            for i in range(self.model.height)
         ]
-        for i in range(settings.BOARD_HEIGHT):
-            for j in range(settings.BOARD_WIDTH):
-                color = random.randint(0, settings.CUSTOM_SETTINGS["num-colors"] - 1)
-                while self.__is_match_generated(i, j, color):
-                    color = random.randint(0, settings.CUSTOM_SETTINGS["num-colors"] - 1)
-
-                self.tiles[i][j] = Tile(
-                    i, j, color, random.randint(0, settings.NUM_VARIETIES - 1)
-                )
-
-    def __calculate_match_rec(self, tile: Tile) -> Set[Tile]:
-        if tile in self.in_stack:
-            return []
-
-        self.in_stack.add(tile)
-
-        color_to_match = tile.color
-
-        ## Check horizontal match
-        h_match: List[Tile] = []
-
-        # Check left
-        if tile.j > 0:
-            left = max(0, tile.j - 2)
-            for j in range(tile.j - 1, left - 1, -1):
-                if self.tiles[tile.i][j].color != color_to_match:
-                    break
-                h_match.append(self.tiles[tile.i][j])
-
-        # Check right
-        if tile.j < settings.BOARD_WIDTH - 1:
-            right = min(settings.BOARD_WIDTH - 1, tile.j + 2)
-            for j in range(tile.j + 1, right + 1):
-                if self.tiles[tile.i][j].color != color_to_match:
-                    break
-                h_match.append(self.tiles[tile.i][j])
-
-        ## Check vertical match
-        v_match: List[Tile] = []
-
-        # Check top
-        if tile.i > 0:
-            top = max(0, tile.i - 2)
-            for i in range(tile.i - 1, top - 1, -1):
-                if self.tiles[i][tile.j].color != color_to_match:
-                    break
-                v_match.append(self.tiles[i][tile.j])
-
-        # Check bottom
-        if tile.i < settings.BOARD_HEIGHT - 1:
-            bottom = min(settings.BOARD_HEIGHT - 1, tile.i + 2)
-            for i in range(tile.i + 1, bottom + 1):
-                if self.tiles[i][tile.j].color != color_to_match:
-                    break
-                v_match.append(self.tiles[i][tile.j])
-
-        match: List[Tile] = []
-
-        if len(h_match) >= 2:
-            for t in h_match:
-                if t not in self.in_match:
-                    self.in_match.add(t)
-                    match.append(t)
-
-        if len(v_match) >= 2:
-            for t in v_match:
-                if t not in self.in_match:
-                    self.in_match.add(t)
-                    match.append(t)
-
-        if len(match) > 0:
-            if tile not in self.in_match:
-                self.in_match.add(tile)
-                match.append(tile)
-
-        for t in match:
-            match += self.__calculate_match_rec(t)
-
-        self.in_stack.remove(tile)
-        return match
-
-    def calculate_matches_for(
-        self, new_tiles: List[Tile]
-    ) -> Optional[List[List[Tile]]]:
-        self.in_match: Set[Tile] = set()
-        self.in_stack: Set[Tile] = set()
-
-        for tile in new_tiles:
-            if tile in self.in_match:
-                continue
-            match = self.__calculate_match_rec(tile)
-            if len(match) > 0:
-                self.matches.append(match)
-
-        delattr(self, "in_match")
-        delattr(self, "in_stack")
-
-        return self.matches if len(self.matches) > 0 else None
-
-    def remove_matches(self) -> int:
-        count = 0
-        for match in self.matches:
-            for tile in match:
-                if tile.powerup == True and tile.active == True:
-                    if tile.type == 1:
-                        for i in range(settings.BOARD_HEIGHT):
-                            if self.tiles[tile.i][tile.j] != self.tiles[i][tile.j]  and self.tiles[i][tile.j] != None:
-                                self.tiles[i][tile.j] = None
-                                count = count + 1
-                        for j in range(settings.BOARD_WIDTH):
-                            if self.tiles[tile.i][tile.j] != self.tiles[tile.i][j]  and self.tiles[tile.i][j] != None:
-                                self.tiles[tile.i][j] = None
-                                count = count + 1
-                    if tile.type == 2:
-                        for i in range(settings.BOARD_HEIGHT):
-                            for j in range(settings.BOARD_WIDTH):
-                                if self.tiles[tile.i][tile.j] != self.tiles[i][j] and self.tiles[i][j] != None:
-                                    if self.tiles[tile.i][tile.j].color == self.tiles[i][j].color:
-                                        self.tiles[i][j] = None
-                                        count = count + 1
-                    settings.SOUNDS["explosion"].stop()
-                    settings.SOUNDS["explosion"].play()
-                    self.tiles[tile.i][tile.j] = None
-                    count = count + 1
-                    break
-                if tile.powerup == False:
-                    count = count + 1
-                    self.tiles[tile.i][tile.j] = None
-        self.matches = []
-        return count
-
-    def get_falling_tiles(self) -> Tuple[Any, Dict[str, Any]]:
-        # List of tweens to create
-        tweens: Tuple[Tile, Dict[str, Any]] = []
-
-        # for each column, go up tile by tile until we hit a space
-        for j in range(settings.BOARD_WIDTH):
-            space = False
-            space_i = -1
-            i = settings.BOARD_HEIGHT - 1
-
-            while i >= 0:
-                tile = self.tiles[i][j]
-
-                # if our previous tile was a space
-                if space:
-                    # if the current tile is not a space
-                    if tile is not None:
-                        self.tiles[space_i][j] = tile
-                        tile.i = space_i
 
-                        # set its prior position to None
-                        self.tiles[i][j] = None
+    def __position(self, tile: Tile) -> int:
+        return tile.i * self.model.width + tile.j
+
+    def __tile_at(self, p: int) -> Optional[Tile]:
+        return self.tiles[p // self.model.width][p % self.model.width]
 
-                        tweens.append((tile, {"y": tile.i * settings.TILE_SIZE}))
-                        space = False
-                        i = space_i
-                        space_i = -1
-                elif tile is None:
-                    space = True
+    def has_moves(self) -> bool:
+        return self.model.has_moves()
 
-                    if space_i == -1:
-                        space_i = i
+    def get_hint(self) -> List[Tuple[int, int]]:
+        return [divmod(p, self.model.width) for p in self.model.get_hint()]
+
+    def search_best_hint(self, time_budget: float) -> None:
+        # Starts the search of the visible move with the best expected score,
+        # of any move if none is visible, on a copy of the board as it is now.
+        moves = [
+            (p, q)
+            for p, q in solver.legal_moves(self.model)
+            if self.is_visible(*divmod(p, self.model.width))
+            and self.is_visible(*divmod(q, self.model.width))
+        ]
+        self.__hint_search.start(
+            self.model.copy(),
+            moves if len(moves) > 0 else None,
+            time_budget,
+            self.rng.getrandbits(64),
+        )
 
-                i -= 1
+    def get_best_hint(self) -> Optional[List[Tuple[int, int]]]:
+        # Cells (i, j) of the move found by the last search, None while it
+        # runs.
+        cells = self.__hint_search.result()
+        if cells is None:
+            return None
+        return [divmod(p, self.model.width) for p in cells]
+
+    def swap_tiles(self, tile1: Tile, tile2: Tile) -> Optional[List[CascadeStep]]:
+        # Swaps the tiles if that makes a match and returns the steps of the
+        # cascade that follows, the model is already in its final state.
+        steps = self.model.play_swap(self.__position(tile1), self.__position(tile2))
+
+        if steps is not None:
+            self.lift(tile1)
+            self.lift(tile2)
+            self.tiles[tile1.i][tile1.j], self.tiles[tile2.i][tile2.j] = tile2, tile1
+            tile1.i, tile1.j, tile2.i, tile2.j = tile2.i, tile2.j, tile1.i, tile1.j
+
+        return steps
+
+    def activate_powerup(self, tile: Tile) -> List[CascadeStep]:
+        return self.model.play_powerup(self.__position(tile))
+
+    def update(self, dt: float) -> None:
+        self.falls.update(dt)
+
+    def apply_step(self, step: CascadeStep) -> List[Tuple[Tile, float]]:
+        # Updates the tiles with a step of a cascade and returns the tiles
+        # that fall with the y they fall to.
+        for p in step.cleared:
+            tile = self.__tile_at(p)
+            self.__moving.pop(tile, None)
+            self.tiles[p // self.model.width][p % self.model.width] = None
+            self.__mark_dirty(divmod(p, self.model.width))
+
+        for p, kind, variety in step.powerups:
+            tile = self.__tile_at(p)
+            tile.powerup = True
+            tile.type = kind
+            tile.variety = variety
+            self.__mark_dirty((tile.i, tile.j))
+
+        if step.exploded:
+            settings.SOUNDS["explosion"].stop()
+            settings.SOUNDS["explosion"].play()
+
+        # List of falls to tween
+        tweens: List[Tuple[Tile, float]] = []
+
+        # The drops of each column come from the bottom up, so the target cell
+        # is always free when a tile falls into it.
+        for p, q in step.drops:
+            i, j = divmod(q, self.model.width)
+            tile = self.__tile_at(p)
+            self.lift(tile)
+            self.tiles[p // self.model.width][j] = None
+            self.tiles[i][j] = tile
+            tile.i = i
+            tweens.append((tile, tile.i * settings.TILE_SIZE))
 
         # create a replacement tiles at the top of the screen
-        for j in range(settings.BOARD_WIDTH):
-            for i in range(settings.BOARD_HEIGHT):
-                tile = self.tiles[i][j]
-
-                if tile is None:
-                    tile = Tile(
-                        i,
-                        j,
-                        random.randint(0, settings.CUSTOM_SETTINGS["num-colors"] - 1),
-                        random.randint(0, settings.NUM_VARIETIES - 1),
-                    )
-                    tile.y -= settings.TILE_SIZE
-                    self.tiles[i][j] = tile
-                    tweens.append((tile, {"y": tile.i * settings.TILE_SIZE}))
-
-        return tweens
\ No newline at end of file
+        for p, color, variety in step.refills:
+            i, j = divmod(p, self.model.width)
+            tile = Tile(i, j, color, variety)
+            tile.y -= settings.TILE_SIZE
+            self.tiles[i][j] = tile
+            self.lift(tile)
+            tweens.append((tile, tile.i * settings.TILE_SIZE))
+
+        return tweens
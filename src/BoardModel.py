@@ -0,0 +1,436 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class BoardModel, the rules of the game without any
+display or audio: generation, swaps, matches, power-ups, gravity, refill and
+score. It does not import pygame nor settings, so it can be used to simulate
+games.
+"""
+from array import array
+from typing import List, Optional, Sequence, Set, Tuple
+
+import random
+
+from src import board_generator, match_engine
+from src.BitBoard import BitBoard
+from src.FrameProfiler import FrameProfiler, timed
+
+# Points for each tile removed
+TILE_SCORE = 50
+
+# Power-up types: clears the row and the column, clears every tile of its color
+POWERUP_LINES = 1
+POWERUP_COLOR = 2
+
+# Variety added to the tile when it becomes a power-up of each type
+POWERUP_VARIETY = {POWERUP_LINES: 5, POWERUP_COLOR: 1}
+
+
+class CascadeStep:
+    # One step of a cascade: the matches found, the tiles removed and the
+    # tiles that fall and refill the board after them.
+    def __init__(self) -> None:
+        # Groups of matched positions, empty when a power-up is activated
+        self.matches: List[List[int]] = []
+        # Flat positions of the removed tiles
+        self.cleared: List[int] = []
+        # (position, type, variety) of the power-ups created by the matches
+        self.powerups: List[Tuple[int, int, int]] = []
+        # Whether at least one power-up was detonated
+        self.exploded = False
+        # (from, to) positions of the falling tiles, bottom-up in each column
+        self.drops: List[Tuple[int, int]] = []
+        # (position, color, variety) of the new tiles
+        self.refills: List[Tuple[int, int, int]] = []
+
+    @property
+    def score(self) -> int:
+        return len(self.cleared) * TILE_SCORE
+
+
+class BoardModel:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        num_colors: int,
+        num_varieties: int = 1,
+        rng: Optional[random.Random] = None,
+        min_moves: int = 1,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.num_colors = num_colors
+        self.num_varieties = num_varieties
+        self.rng = rng if rng is not None else random.Random()
+        # Minimum number of legal swaps of a generated board
+        self.min_moves = min_moves
+
+        # Flat grids indexed by i * width + j
+        self.colors = match_engine.new_grid(width, height)
+        self.varieties = array("b", [0]) * (width * height)
+        self.powerups = array("b", [0]) * (width * height)
+
+        # One bitmask per color, used to find matches and moves
+        self.bitboard = BitBoard(width, height, num_colors)
+
+        # Positions of each color, so a color power-up only visits the tiles
+        # of its color
+        self.color_cells: List[Set[int]] = [set() for _ in range(num_colors)]
+
+        # Index of the legal moves: swap masks for each color and positions of
+        # the power-ups. The masks are only recomputed for the colors that
+        # changed since the last query.
+        self.color_moves: List[Tuple[int, int]] = [(0, 0)] * num_colors
+        self.powerup_cells: Set[int] = set()
+        self.__dirty_colors: Set[int] = set()
+
+        # Times the matches, removals, falls and move checks when it is set
+        self.profiler: Optional[FrameProfiler] = None
+
+        self.generate()
+
+    def copy(self, rng: Optional[random.Random] = None) -> "BoardModel":
+        # Returns an independent board in the same state. The copy draws its
+        # refills from the given generator.
+        model = BoardModel.__new__(BoardModel)
+        model.__dict__.update(self.__dict__)
+        model.rng = rng if rng is not None else random.Random()
+        model.colors = array("b", self.colors)
+        model.varieties = array("b", self.varieties)
+        model.powerups = array("b", self.powerups)
+        model.bitboard = self.bitboard.copy()
+        model.color_cells = [set(cells) for cells in self.color_cells]
+        model.color_moves = list(self.color_moves)
+        model.powerup_cells = set(self.powerup_cells)
+        model.__dirty_colors = set(self.__dirty_colors)
+        # Only the board on screen is profiled, not its simulations
+        model.profiler = None
+        return model
+
+    def set_cell(self, p: int, color: int, variety: int = 0, powerup: int = 0) -> None:
+        old_color = self.colors[p]
+
+        if old_color != color:
+            self.colors[p] = color
+            if old_color != match_engine.EMPTY:
+                self.bitboard.clear(p, old_color)
+                self.color_cells[old_color].discard(p)
+                self.__dirty_colors.add(old_color)
+            if color != match_engine.EMPTY:
+                self.bitboard.set(p, color)
+                self.color_cells[color].add(p)
+                self.__dirty_colors.add(color)
+
+        self.varieties[p] = variety
+        self.powerups[p] = powerup
+
+        if powerup:
+            self.powerup_cells.add(p)
+        else:
+            self.powerup_cells.discard(p)
+
+    def clear_cell(self, p: int) -> None:
+        self.set_cell(p, match_engine.EMPTY)
+
+    def random_color(self) -> int:
+        return self.rng.randint(0, self.num_colors - 1)
+
+    def random_variety(self) -> int:
+        return self.rng.randint(0, self.num_varieties - 1)
+
+    def load(self, colors: Sequence[int]) -> None:
+        # Fills the board with the given colors and random varieties
+        for p, color in enumerate(colors):
+            self.set_cell(p, color, self.random_variety())
+
+    def generate(self) -> None:
+        self.load(
+            board_generator.generate_colors(
+                self.width, self.height, self.num_colors, self.rng, self.min_moves
+            )
+        )
+
+    def swap(self, p: int, q: int) -> None:
+        cell_p = (self.colors[p], self.varieties[p], self.powerups[p])
+        cell_q = (self.colors[q], self.varieties[q], self.powerups[q])
+        self.set_cell(p, *cell_q)
+        self.set_cell(q, *cell_p)
+
+    @timed("match")
+    def find_matches(self, cells: Optional[Sequence[int]] = None) -> List[List[int]]:
+        groups = match_engine.group_runs(self.bitboard.runs())
+
+        if cells is None:
+            return groups
+
+        cells = set(cells)
+        return [group for group in groups if not cells.isdisjoint(group)]
+
+    def __update_moves(self) -> None:
+        for color in self.__dirty_colors:
+            self.color_moves[color] = self.bitboard.color_moves(color)
+
+        self.__dirty_colors.clear()
+
+    @timed("can_play")
+    def has_moves(self) -> bool:
+        self.__update_moves()
+        return len(self.powerup_cells) > 0 or any(
+            right or down for right, down in self.color_moves
+        )
+
+    def get_legal_moves(self) -> List[Tuple[int, int]]:
+        # Swaps (p, q) of flat positions that make a match
+        self.__update_moves()
+        moves = []
+
+        for right, down in self.color_moves:
+            moves += [(p, p + 1) for p in BitBoard.positions(right)]
+            moves += [(p, p + self.width) for p in BitBoard.positions(down)]
+
+        return moves
+
+    @timed("can_play")
+    def get_hint(self) -> List[int]:
+        # Cells to highlight for an available move: a power-up to activate or
+        # the tiles that match after a legal swap.
+        self.__update_moves()
+
+        if len(self.powerup_cells) > 0:
+            return [min(self.powerup_cells)]
+
+        for right, down in self.color_moves:
+            if right or down:
+                p = next(BitBoard.positions(right | down))
+                q = p + 1 if right >> p & 1 else p + self.width
+                return match_engine.swap_match_cells(
+                    self.colors, self.width, self.height, p, q
+                )
+
+        return []
+
+    def __blast(self, p: int) -> List[int]:
+        # Cells hit by the power-up in p, besides p itself
+        i, j = divmod(p, self.width)
+
+        if self.powerups[p] == POWERUP_LINES:
+            cells = [k * self.width + j for k in range(self.height) if k != i]
+            cells += [i * self.width + k for k in range(self.width) if k != j]
+            return cells
+
+        return sorted(self.color_cells[self.colors[p]] - {p})
+
+    def __clear(self, cells: Sequence[int], result: CascadeStep) -> None:
+        # Clears the cells with a worklist. The power-ups among them detonate
+        # and add their blast to the worklist, so chained power-ups detonate
+        # too. The visited mask makes every cell, and so every power-up, be
+        # cleared exactly once, and the masks of the colors are updated once
+        # at the end.
+        visited = 0
+        worklist = list(reversed(cells))
+        colors: Set[int] = set()
+
+        while len(worklist) > 0:
+            p = worklist.pop()
+            bit = 1 << p
+            color = self.colors[p]
+            if visited & bit or color == match_engine.EMPTY:
+                continue
+            visited |= bit
+
+            if self.powerups[p]:
+                worklist += reversed(self.__blast(p))
+                self.powerup_cells.discard(p)
+                result.exploded = True
+
+            self.colors[p] = match_engine.EMPTY
+            self.varieties[p] = 0
+            self.powerups[p] = 0
+            self.color_cells[color].discard(p)
+            colors.add(color)
+            result.cleared.append(p)
+
+        for color in colors:
+            self.bitboard.masks[color] &= ~visited
+            self.__dirty_colors.add(color)
+
+    @timed("remove")
+    def resolve_matches(
+        self, matches: List[List[int]], swapped: Sequence[int] = ()
+    ) -> CascadeStep:
+        # Removes the matched tiles. A match of four creates a power-up that
+        # clears its row and column and a match of five or more creates a
+        # power-up that clears its color. The power-up is placed in the
+        # swapped tile when it is part of the match, otherwise in the first
+        # tile of the match. Power-ups that were already in a match detonate,
+        # and so do the ones caught in their blasts.
+        result = CascadeStep()
+        result.matches = matches
+        created: Set[int] = set()
+
+        for match in matches:
+            if len(match) < 4:
+                continue
+
+            candidates = [p for p in swapped if p in match] + [match[0]]
+            p = candidates[0]
+            if self.powerups[p]:
+                continue
+
+            kind = POWERUP_LINES if len(match) == 4 else POWERUP_COLOR
+            self.set_cell(
+                p, self.colors[p], self.varieties[p] + POWERUP_VARIETY[kind], kind
+            )
+            created.add(p)
+            result.powerups.append((p, kind, self.varieties[p]))
+
+        # The new power-ups stay, unless the blast of another one hits them
+        self.__clear(
+            [p for match in matches for p in match if p not in created], result
+        )
+
+        result.powerups = [
+            (p, kind, variety)
+            for p, kind, variety in result.powerups
+            if self.powerups[p]
+        ]
+
+        return result
+
+    @timed("remove")
+    def activate_powerup(self, p: int) -> CascadeStep:
+        result = CascadeStep()
+
+        if self.powerups[p]:
+            self.__clear([p], result)
+
+        return result
+
+    @timed("fall")
+    def apply_gravity(self) -> Tuple[List[Tuple[int, int]], List[int]]:
+        # Makes the tiles fall into the empty cells and refills the board from
+        # the top. Returns the (from, to) positions of the tiles that fell,
+        # from the bottom up in each column, and the positions of the new
+        # tiles. Each column is compacted as a whole slice of the grids.
+        drops: List[Tuple[int, int]] = []
+        refills: List[int] = []
+        w, h = self.width, self.height
+
+        # Bits that leave and enter each color mask
+        cleared = [0] * self.num_colors
+        added = [0] * self.num_colors
+
+        for j in range(w):
+            column = self.colors[j::w]
+            if match_engine.EMPTY not in column:
+                continue
+
+            kept = [i for i, color in enumerate(column) if color != match_engine.EMPTY]
+            empty = h - len(kept)
+
+            varieties = self.varieties[j::w]
+            powerups = self.powerups[j::w]
+
+            # The new tiles go on top of the ones that were kept
+            new_colors = array("b", [self.random_color() for _ in range(empty)])
+            new_colors.extend(column[i] for i in kept)
+            new_varieties = array("b", [self.random_variety() for _ in range(empty)])
+            new_varieties.extend(varieties[i] for i in kept)
+            new_powerups = array("b", [0] * empty)
+            new_powerups.extend(powerups[i] for i in kept)
+
+            self.colors[j::w] = new_colors
+            self.varieties[j::w] = new_varieties
+            self.powerups[j::w] = new_powerups
+
+            drops += [
+                (i * w + j, (empty + k) * w + j)
+                for k, i in reversed(list(enumerate(kept)))
+                if i != empty + k
+            ]
+            refills += [i * w + j for i in range(empty)]
+
+            for i, (old, new) in enumerate(zip(column, new_colors)):
+                if old != new:
+                    q = i * w + j
+                    bit = 1 << q
+                    if old != match_engine.EMPTY:
+                        cleared[old] |= bit
+                        self.color_cells[old].discard(q)
+                    added[new] |= bit
+                    self.color_cells[new].add(q)
+
+            if any(new_powerups):
+                for i, kind in enumerate(new_powerups):
+                    if kind:
+                        self.powerup_cells.add(i * w + j)
+                    else:
+                        self.powerup_cells.discard(i * w + j)
+
+        for color in range(self.num_colors):
+            if cleared[color] or added[color]:
+                masks = self.bitboard.masks
+                masks[color] = (masks[color] & ~cleared[color]) | added[color]
+                self.__dirty_colors.add(color)
+
+        return drops, refills
+
+    def __fall(self, step: CascadeStep) -> List[int]:
+        # Applies the gravity for the step and returns the cells that changed
+        step.drops, refills = self.apply_gravity()
+        step.refills = [(p, self.colors[p], self.varieties[p]) for p in refills]
+        return [q for _, q in step.drops] + refills
+
+    def resolve_cascade(
+        self, cells: Sequence[int], swapped: Sequence[int] = ()
+    ) -> List[CascadeStep]:
+        # Resolves the whole chain of matches caused by a change in the given
+        # cells, step by step until the board is stable.
+        steps: List[CascadeStep] = []
+        matches = self.find_matches(cells)
+
+        while len(matches) > 0:
+            step = self.resolve_matches(matches, swapped)
+            cells = self.__fall(step)
+            steps.append(step)
+
+            # The swapped tiles only hold the power-ups of the first step
+            swapped = ()
+            matches = self.find_matches(cells)
+
+        return steps
+
+    def play_swap(self, p: int, q: int) -> Optional[List[CascadeStep]]:
+        # Swaps two adjacent tiles and resolves the cascade. When the swap
+        # does not make a match the board is left untouched and None is
+        # returned.
+        i1, j1 = divmod(p, self.width)
+        i2, j2 = divmod(q, self.width)
+        if abs(i1 - i2) + abs(j1 - j2) != 1 or not match_engine.swap_makes_match(
+            self.colors, self.width, self.height, p, q
+        ):
+            return None
+
+        self.swap(p, q)
+        return self.resolve_cascade((p, q), (p, q))
+
+    def play_powerup(self, p: int) -> List[CascadeStep]:
+        # Detonates a power-up and resolves the cascade after it.
+        if not self.powerups[p]:
+            return []
+
+        step = self.activate_powerup(p)
+        cells = self.__fall(step)
+
+        return [step] + self.resolve_cascade(cells)
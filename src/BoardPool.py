@@ -0,0 +1,119 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class BoardPool, a pool of boards generated in a
+background thread so the states can get a new board without generating it.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import random
+import threading
+
+from src.BoardModel import BoardModel
+
+
+class BoardPool:
+    def __init__(self, size: int = 2, rng: Optional[random.Random] = None) -> None:
+        self.size = size
+        self.rng = rng if rng is not None else random.Random()
+
+        # (width, height, num_colors, num_varieties, min_moves) of the boards
+        self.__key: Optional[Tuple[int, int, int, int, int]] = None
+        # Boards are numbered in the order they are taken and each number has
+        # its own seed, so the sequence of boards does not depend on which
+        # thread builds them.
+        self.__seeds: List[int] = []
+        self.__taken = 0
+        self.__boards: Dict[int, BoardModel] = {}
+        self.__condition = threading.Condition()
+        self.__worker: Optional[threading.Thread] = None
+
+    def seed(self, seed: int) -> None:
+        # Restarts the sequence of boards from the given seed
+        with self.__condition:
+            self.rng.seed(seed)
+            self.__seeds = []
+            self.__taken = 0
+            self.__boards = {}
+            self.__condition.notify()
+
+    def configure(
+        self,
+        width: int,
+        height: int,
+        num_colors: int,
+        num_varieties: int = 1,
+        min_moves: int = 1,
+    ) -> None:
+        # Sets the kind of boards to generate, the boards of another kind that
+        # are in the pool are dropped.
+        key = (width, height, num_colors, num_varieties, min_moves)
+
+        with self.__condition:
+            if key != self.__key:
+                self.__key = key
+                self.__boards = {}
+                self.__condition.notify()
+
+            if self.__worker is None:
+                self.__worker = threading.Thread(target=self.__fill, daemon=True)
+                self.__worker.start()
+
+    def take(self) -> BoardModel:
+        # Returns a board from the pool or generates it if the pool is empty.
+        with self.__condition:
+            key = self.__key
+            index = self.__taken
+            self.__taken += 1
+            seed = self.__seed(index)
+            model = self.__boards.pop(index, None)
+            self.__condition.notify()
+
+        return model if model is not None else self.__build(key, seed)
+
+    def __seed(self, index: int) -> int:
+        while len(self.__seeds) <= index:
+            self.__seeds.append(self.rng.getrandbits(64))
+        return self.__seeds[index]
+
+    def __build(self, key: Tuple[int, int, int, int, int], seed: int) -> BoardModel:
+        width, height, num_colors, num_varieties, min_moves = key
+        return BoardModel(
+            width,
+            height,
+            num_colors,
+            num_varieties,
+            rng=random.Random(seed),
+            min_moves=min_moves,
+        )
+
+    def __fill(self) -> None:
+        while True:
+            with self.__condition:
+                while self.__key is None or len(self.__boards) >= self.size:
+                    self.__condition.wait()
+                key = self.__key
+                index = self.__taken + len(self.__boards)
+                seed = self.__seed(index)
+
+            model = self.__build(key, seed)
+
+            # The board is dropped if it was taken, or the kind or the seed
+            # changed meanwhile
+            with self.__condition:
+                if (
+                    key == self.__key
+                    and index >= self.__taken
+                    and self.__seed(index) == seed
+                ):
+                    self.__boards[index] = model
@@ -0,0 +1,152 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class FrameProfiler, that times the update and the
+render of every frame by state and the board operations run in it, keeps the
+times of the last frames to show their percentiles and writes one record per
+frame to a CSV file.
+
+It does not import pygame, so the board model can be timed with it.
+"""
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, TextIO, Tuple
+
+import csv
+import functools
+import time
+
+# Frames kept to compute the percentiles
+WINDOW = 300
+
+# Operations of the board timed by the model
+OPERATIONS = ("match", "remove", "fall", "can_play")
+
+PERCENTILES = (50, 95, 99)
+
+
+def timed(operation: str) -> Callable:
+    # Decorates a method of an object with a profiler attribute to add the
+    # time of each call to the operation, the method is called as is when the
+    # object has no profiler.
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.add(operation, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class FrameProfiler:
+    def __init__(self, window: int = WINDOW) -> None:
+        self.window = window
+        self.frame = 0
+        # Times in seconds of the last frames by section: "frame", the
+        # operations and "<state> update" and "<state> render"
+        self.samples: Dict[str, Deque[float]] = {}
+
+        # Seconds and calls of each section in the current frame
+        self.__times: Dict[str, float] = {}
+        self.__calls: Dict[str, int] = {}
+        self.__start = time.perf_counter()
+        self.__last = self.__start
+
+        self.__file: Optional[TextIO] = None
+        self.__writer: Optional[Any] = None
+
+    def open(self, path: Path) -> None:
+        # Writes a record of each frame from now on to a CSV file
+        self.close()
+        self.__file = open(path, "w", newline="")
+        self.__writer = csv.writer(self.__file)
+        header = ["frame", "time", "frame_ms", "state", "update_ms", "render_ms"]
+        for operation in OPERATIONS:
+            header += [f"{operation}_ms", f"{operation}_calls"]
+        self.__writer.writerow(header)
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+            self.__writer = None
+
+    def add(self, section: str, seconds: float) -> None:
+        self.__times[section] = self.__times.get(section, 0.0) + seconds
+        self.__calls[section] = self.__calls.get(section, 0) + 1
+
+    def __sample(self, section: str, seconds: float) -> None:
+        samples = self.samples.get(section)
+        if samples is None:
+            samples = self.samples[section] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def end_frame(self, state: str) -> None:
+        # Closes the frame run by the given state: keeps its times and writes
+        # its record.
+        now = time.perf_counter()
+        frame_time = now - self.__last
+        self.__last = now
+
+        update_time = self.__times.get("update", 0.0)
+        render_time = self.__times.get("render", 0.0)
+        self.__sample("frame", frame_time)
+        self.__sample(f"{state} update", update_time)
+        self.__sample(f"{state} render", render_time)
+
+        for operation in OPERATIONS:
+            if operation in self.__calls:
+                self.__sample(operation, self.__times[operation])
+
+        if self.__writer is not None:
+            record = [
+                self.frame,
+                f"{now - self.__start:.4f}",
+                f"{frame_time * 1000:.3f}",
+                state,
+                f"{update_time * 1000:.3f}",
+                f"{render_time * 1000:.3f}",
+            ]
+            for operation in OPERATIONS:
+                record += [
+                    f"{self.__times.get(operation, 0.0) * 1000:.3f}",
+                    self.__calls.get(operation, 0),
+                ]
+            self.__writer.writerow(record)
+
+        self.__times.clear()
+        self.__calls.clear()
+        self.frame += 1
+
+    def percentiles(self, section: str) -> Optional[Tuple[float, ...]]:
+        # Percentiles in milliseconds of the times of the section in the last
+        # frames, None if it was not run in them.
+        samples = self.samples.get(section)
+        if not samples:
+            return None
+
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(
+            ordered[round(last * percentile / 100)] * 1000
+            for percentile in PERCENTILES
+        )
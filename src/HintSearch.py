@@ -0,0 +1,82 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class HintSearch, that searches the best move of a board
+in a background thread so the frames are not stopped by the search.
+"""
+from typing import List, Optional
+
+import random
+import threading
+
+from src import solver
+from src.BoardModel import BoardModel
+
+
+class HintSearch:
+    def __init__(self, depth: int = 2, samples: int = 2) -> None:
+        self.depth = depth
+        self.samples = samples
+        self.__lock = threading.Lock()
+        # Number of the last search, the results of the older ones are dropped
+        self.__search = 0
+        self.__cells: Optional[List[int]] = None
+
+    def start(
+        self,
+        model: BoardModel,
+        moves: Optional[List[solver.Move]],
+        time_budget: float,
+        seed: int,
+    ) -> None:
+        # Searches the best of the moves, or of all the legal ones, in the
+        # given board. The board must not change while it is searched, so it
+        # is usually a copy.
+        with self.__lock:
+            self.__search += 1
+            self.__cells = None
+            search = self.__search
+
+        threading.Thread(
+            target=self.__run,
+            args=(search, model, moves, time_budget, seed),
+            daemon=True,
+        ).start()
+
+    def __run(
+        self,
+        search: int,
+        model: BoardModel,
+        moves: Optional[List[solver.Move]],
+        time_budget: float,
+        seed: int,
+    ) -> None:
+        move = solver.best_move(
+            model,
+            depth=self.depth,
+            samples=self.samples,
+            time_budget=time_budget,
+            rng=random.Random(seed),
+            moves=moves,
+        )
+        cells = solver.move_hint(model, move) if move is not None else []
+
+        with self.__lock:
+            if search == self.__search:
+                self.__cells = cells
+
+    def result(self) -> Optional[List[int]]:
+        # Flat positions to highlight for the best move, None while the last
+        # search runs.
+        with self.__lock:
+            return self.__cells
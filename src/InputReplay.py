@@ -0,0 +1,149 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the classes InputRecorder and InputPlayer to record the
+inputs of a game to a file and feed them back to the game.
+
+A replay file starts with a header with the seed of the game, the size of the
+board and the input ids used, followed by a record per input and a record per
+frame, in the order they happened. An input record has the index of the input
+id, the pressed and released flags and the position. A frame record has the
+seconds of the frame, and closes the frame of the inputs before it, so a
+replay feeds every input in the same frame and runs every frame with the same
+dt as the game recorded.
+"""
+from pathlib import Path
+from typing import BinaryIO, List, Tuple
+
+import struct
+
+from gale.input_handler import InputHandler, InputData
+
+MAGIC = b"M3RP"
+VERSION = 2
+
+# magic, version, seed, board width, board height, number of input ids
+HEADER = struct.Struct("<4sBqHHB")
+
+# Kinds of record
+INPUT = 0
+FRAME = 1
+
+# kind, input id index, flags, x, y
+INPUT_RECORD = struct.Struct("<BBBhh")
+# kind, dt
+FRAME_RECORD = struct.Struct("<Bd")
+
+PRESSED = 1
+RELEASED = 2
+
+# Inputs that change the game, the quit input is not replayed
+INPUT_IDS = ("click", "click3", "mouse_motion", "enter", "up", "down", "left", "right")
+
+Event = Tuple[str, bool, bool, Tuple[int, int]]
+
+
+class InputRecorder:
+    def __init__(
+        self, path: Path, seed: int, board_width: int, board_height: int
+    ) -> None:
+        self.seed = seed
+        self.__file: BinaryIO = open(path, "wb")
+        self.__file.write(
+            HEADER.pack(MAGIC, VERSION, seed, board_width, board_height, len(INPUT_IDS))
+        )
+        for input_id in INPUT_IDS:
+            name = input_id.encode()
+            self.__file.write(struct.pack("<B", len(name)) + name)
+
+    def update(self, dt: float) -> None:
+        # Closes the frame, with the inputs recorded since the last one
+        if not self.__file.closed:
+            self.__file.write(FRAME_RECORD.pack(FRAME, dt))
+
+    def record(self, input_id: str, input_data: InputData) -> None:
+        if self.__file.closed or input_id not in INPUT_IDS:
+            return
+
+        x, y = input_data.position
+        flags = (PRESSED if input_data.pressed else 0) | (
+            RELEASED if input_data.released else 0
+        )
+        self.__file.write(
+            INPUT_RECORD.pack(INPUT, INPUT_IDS.index(input_id), flags, x, y)
+        )
+        # Inputs are few, so a crash loses nothing recorded
+        self.__file.flush()
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class InputPlayer:
+    def __init__(self, path: Path) -> None:
+        # dt of each frame and the inputs fed before its update
+        self.frames: List[Tuple[float, List[Event]]] = []
+        self.__next = 0
+        self.__load(Path(path).read_bytes())
+
+    def __load(self, data: bytes) -> None:
+        (
+            magic,
+            version,
+            self.seed,
+            self.board_width,
+            self.board_height,
+            num_ids,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a replay file of this version of the game")
+
+        offset = HEADER.size
+        input_ids = []
+        for _ in range(num_ids):
+            size = data[offset]
+            input_ids.append(data[offset + 1 : offset + 1 + size].decode())
+            offset += 1 + size
+
+        events: List[Event] = []
+        while offset < len(data):
+            if data[offset] == FRAME:
+                if offset + FRAME_RECORD.size > len(data):
+                    break
+                _, dt = FRAME_RECORD.unpack_from(data, offset)
+                offset += FRAME_RECORD.size
+                self.frames.append((dt, events))
+                events = []
+            else:
+                if offset + INPUT_RECORD.size > len(data):
+                    break
+                _, index, flags, x, y = INPUT_RECORD.unpack_from(data, offset)
+                offset += INPUT_RECORD.size
+                pressed, released = bool(flags & PRESSED), bool(flags & RELEASED)
+                events.append((input_ids[index], pressed, released, (x, y)))
+
+    def finished(self) -> bool:
+        return self.__next >= len(self.frames)
+
+    def next_frame(self) -> float:
+        # Feeds the listeners with the inputs of the next frame and returns
+        # its dt
+        dt, events = self.frames[self.__next]
+        self.__next += 1
+
+        for input_id, pressed, released, position in events:
+            input_data = InputData(pressed=pressed, released=released, position=position)
+            for listener in list(InputHandler.listeners):
+                listener.on_input(input_id, input_data)
+
+        return dt
@@ -13,19 +13,78 @@ lewis8a@gmail.com
 
 This file contains the class Match3 as a specialization of gale.Game
 """
+from pathlib import Path
+from typing import Any, Optional
+
+import random
+import time
+
 import pygame
 
 from gale.game import Game
 from gale.input_handler import InputHandler, InputData
-from gale.state_machine import StateMachine
+from gale.timer import Timer
 
 import settings
 from src import states
+from src.Board import Board
+from src.FrameProfiler import OPERATIONS
+from src.InputReplay import InputPlayer, InputRecorder
+from src.ScheduledStateMachine import ScheduledStateMachine
+from src.text_cache import render_text
+
+# Seconds between updates of the profiler overlay
+PROFILER_REFRESH = 0.5
 
 class Match3(Game):
+    def __init__(
+        self,
+        *args: Any,
+        seed: Optional[int] = None,
+        record: Optional[Path] = None,
+        replay: Optional[Path] = None,
+        profile: Optional[Path] = None,
+        **kwargs: Any,
+    ) -> None:
+        # The game is always seeded so it can be recorded and replayed, a
+        # replay uses the seed and the board size of its recording.
+        self.player = InputPlayer(replay) if replay is not None else None
+        if self.player is not None:
+            seed = self.player.seed
+            settings.BOARD_WIDTH = self.player.board_width
+            settings.BOARD_HEIGHT = self.player.board_height
+        elif seed is None:
+            seed = random.getrandbits(63)
+
+        self.seed = seed
+        settings.RNG.seed(seed)
+        settings.BOARD_POOL.seed(settings.RNG.getrandbits(64))
+
+        self.recorder = (
+            InputRecorder(record, seed, settings.BOARD_WIDTH, settings.BOARD_HEIGHT)
+            if record is not None and self.player is None
+            else None
+        )
+
+        # The frames are always timed, they are written to a file only when
+        # requested
+        self.profiler = settings.PROFILER
+        if profile is not None:
+            self.profiler.open(profile)
+        self.show_profiler = False
+        self.profiler_overlay: Optional[pygame.Surface] = None
+        self.profiler_timer = 0.0
+        super().__init__(*args, **kwargs)
+
     def init(self) -> None:
+        # The window exists now, so the textures can take its pixel format
+        settings.TEXTURES["background"] = settings.TEXTURES["background"].convert()
+        for atlas in settings.ATLASES.values():
+            atlas.convert()
+        settings.TEXTURES["tiles"] = settings.ATLASES["tiles"].texture
+
         pygame.mixer.music.play(loops=-1)
-        self.state_machine = StateMachine(
+        self.state_machine = ScheduledStateMachine(
             {
                 "start": lambda sm: states.StartState(sm, self),
                 "begin": states.BeginGameState,
@@ -35,22 +94,129 @@ class Match3(Game):
                 "settings": states.SettingsState,
             }
         )
+        # Start generating boards while the player is in the menus
+        Board.configure_pool()
         self.state_machine.change("start")
         self.background_x = 0
         InputHandler.register_listener(self)
 
+    def exec(self) -> None:
+        if self.player is not None and not self.__replay():
+            return
+        # The player takes over when the replay ends
+        super().exec()
+
+    def __replay(self) -> bool:
+        # Runs the recorded frames with their dt, feeding their inputs before
+        # the timers and the update as gale's loop does. The live input is
+        # ignored, only closing the window stops the replay. Returns whether
+        # the game goes on.
+        surface = pygame.Surface((settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT))
+        window = pygame.display.get_surface()
+        clock = pygame.time.Clock()
+
+        while not self.player.finished():
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                if self.recorder is not None:
+                    self.recorder.close()
+                self.profiler.close()
+                self.quit()
+                return False
+
+            dt = self.player.next_frame()
+            Timer.update(dt)
+            self.update(dt)
+            self.render(surface)
+            pygame.transform.scale(surface, window.get_size(), window)
+            pygame.display.flip()
+            # Plays the frames at the recorded pace
+            clock.tick(1 / dt if dt > 0 else 0)
+
+        return True
+
     def update(self, dt: float) -> None:
+        if self.recorder is not None:
+            self.recorder.update(dt)
+
         self.background_x -= settings.BACKGROUND_SCROLL_SPEED * dt
 
         if self.background_x <= settings.BACKGROUND_LOOPING_POINT:
             self.background_x = 0
 
+        start = time.perf_counter()
+        settings.SCHEDULER.update(dt)
         self.state_machine.update(dt)
+        self.profiler.add("update", time.perf_counter() - start)
+
+        if self.show_profiler:
+            self.profiler_timer -= dt
+            if self.profiler_timer <= 0:
+                self.profiler_timer = PROFILER_REFRESH
+                self.__build_profiler_overlay()
 
     def render(self, surface: pygame.Surface) -> None:
         surface.blit(settings.TEXTURES["background"], (self.background_x, 0))
+
+        start = time.perf_counter()
         self.state_machine.render(surface)
+        self.profiler.add("render", time.perf_counter() - start)
+
+        # The overlay is drawn out of the timed render
+        if self.show_profiler and self.profiler_overlay is not None:
+            surface.blit(
+                self.profiler_overlay,
+                (settings.VIRTUAL_WIDTH - self.profiler_overlay.get_width(), 0),
+            )
+
+        self.profiler.end_frame(type(self.state_machine.current).__name__)
+
+    def __build_profiler_overlay(self) -> None:
+        # p50/p95/p99 in ms of the frame, the current state and the board
+        # operations in the last frames, drawn in a panel that is blitted
+        # until the next refresh
+        state = type(self.state_machine.current).__name__
+        rows = [(state, ("p50", "p95", "p99"))]
+
+        for section in ("frame", f"{state} update", f"{state} render") + OPERATIONS:
+            percentiles = self.profiler.percentiles(section)
+            if percentiles is not None:
+                rows.append(
+                    (
+                        section.replace(f"{state} ", ""),
+                        tuple(f"{value:.2f}" for value in percentiles),
+                    )
+                )
+
+        self.profiler_overlay = pygame.Surface(
+            (192, len(rows) * 12 + 8), pygame.SRCALPHA
+        )
+        self.profiler_overlay.fill((0, 0, 0, 160))
+
+        for k, (name, values) in enumerate(rows):
+            y = 4 + k * 12
+            render_text(
+                self.profiler_overlay, name, settings.FONTS["small"], 4, y, (255, 255, 255)
+            )
+            for n, value in enumerate(values):
+                render_text(
+                    self.profiler_overlay,
+                    value,
+                    settings.FONTS["small"],
+                    92 + n * 34,
+                    y,
+                    (255, 255, 255),
+                )
 
     def on_input(self, input_id: str, input_data: InputData) -> None:
+        if self.recorder is not None:
+            self.recorder.record(input_id, input_data)
+
+        if input_id == "profiler" and input_data.pressed:
+            self.show_profiler = not self.show_profiler
+            self.profiler_timer = 0.0
+
         if input_id == "quit" and input_data.pressed:
+            if self.recorder is not None:
+                self.recorder.close()
+            self.profiler.close()
             self.quit()
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class ScheduledStateMachine, a gale StateMachine that
+cancels the timers of the scheduler grouped by a state when the machine
+leaves it.
+"""
+from typing import Any
+
+from gale.state_machine import StateMachine
+
+import settings
+
+
+class ScheduledStateMachine(StateMachine):
+    def change(self, state_name: str, *args: Any, **kwargs: Any) -> None:
+        previous = self.current
+        super().change(state_name, *args, **kwargs)
+        settings.SCHEDULER.cancel_group(previous)
@@ -0,0 +1,156 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class Scheduler, that calls functions after a delay or
+every interval of game time. The timers wait in a priority queue ordered by
+deadline, so an update only visits the timers that are due. Every timer may
+belong to a group, usually the state that created it, to cancel all of them
+at once, and may have a name to find it or replace it.
+"""
+from itertools import count
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import heapq
+
+
+class ScheduledTimer:
+    def __init__(
+        self,
+        interval: float,
+        callback: Callable[[], Any],
+        limit: Optional[int],
+        group: Hashable,
+        name: Optional[str],
+    ) -> None:
+        self.interval = interval
+        self.callback = callback
+        # Calls left, None to repeat until it is cancelled
+        self.limit = limit
+        self.group = group
+        self.name = name
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        # The scheduler drops it when its deadline comes
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self) -> None:
+        self.time = 0.0
+        # (deadline, order, timer), the order breaks the ties between timers
+        # with the same deadline in the order they were scheduled
+        self.__queue: List[Tuple[float, int, ScheduledTimer]] = []
+        self.__order = count()
+        self.__groups: Dict[Hashable, Set[ScheduledTimer]] = {}
+        self.__names: Dict[Tuple[Hashable, str], ScheduledTimer] = {}
+
+    def __schedule(self, timer: ScheduledTimer, deadline: float) -> None:
+        heapq.heappush(self.__queue, (deadline, next(self.__order), timer))
+
+    def __add(
+        self,
+        delay: float,
+        interval: float,
+        callback: Callable[[], Any],
+        limit: Optional[int],
+        group: Hashable,
+        name: Optional[str],
+    ) -> ScheduledTimer:
+        if name is not None:
+            # A timer replaces the one of its group with the same name
+            self.cancel(group, name)
+
+        timer = ScheduledTimer(interval, callback, limit, group, name)
+        self.__groups.setdefault(group, set()).add(timer)
+        if name is not None:
+            self.__names[(group, name)] = timer
+
+        self.__schedule(timer, self.time + delay)
+        return timer
+
+    def after(
+        self,
+        delay: float,
+        callback: Callable[[], Any],
+        group: Hashable = None,
+        name: Optional[str] = None,
+    ) -> ScheduledTimer:
+        return self.__add(delay, delay, callback, 1, group, name)
+
+    def every(
+        self,
+        interval: float,
+        callback: Callable[[], Any],
+        group: Hashable = None,
+        name: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ScheduledTimer:
+        # An update calls the timer once for each interval that passed, so
+        # the interval must be positive to end
+        if interval <= 0:
+            raise ValueError(f"The interval of a timer must be positive, not {interval}")
+        return self.__add(interval, interval, callback, limit, group, name)
+
+    def get(self, group: Hashable, name: str) -> Optional[ScheduledTimer]:
+        timer = self.__names.get((group, name))
+        return timer if timer is not None and not timer.cancelled else None
+
+    def cancel(self, group: Hashable, name: str) -> None:
+        timer = self.__names.pop((group, name), None)
+        if timer is not None:
+            self.__release(timer)
+
+    def cancel_group(self, group: Hashable) -> None:
+        for timer in self.__groups.pop(group, ()):
+            timer.cancel()
+            if timer.name is not None:
+                self.__names.pop((group, timer.name), None)
+
+    def clear(self) -> None:
+        for _, _, timer in self.__queue:
+            timer.cancel()
+        self.__queue.clear()
+        self.__groups.clear()
+        self.__names.clear()
+
+    def __release(self, timer: ScheduledTimer) -> None:
+        timer.cancel()
+        timers = self.__groups.get(timer.group)
+        if timers is not None:
+            timers.discard(timer)
+            if len(timers) == 0:
+                del self.__groups[timer.group]
+        if timer.name is not None and self.__names.get((timer.group, timer.name)) is timer:
+            del self.__names[(timer.group, timer.name)]
+
+    def update(self, dt: float) -> None:
+        # Calls the timers whose deadline passed, in order. A timer that
+        # repeats is called once for each interval that passed.
+        self.time += dt
+        queue = self.__queue
+
+        while len(queue) > 0 and queue[0][0] <= self.time:
+            deadline, _, timer = heapq.heappop(queue)
+            if timer.cancelled:
+                self.__release(timer)
+                continue
+
+            if timer.limit is not None:
+                timer.limit -= 1
+            if timer.limit is None or timer.limit > 0:
+                self.__schedule(timer, deadline + timer.interval)
+            else:
+                self.__release(timer)
+
+            timer.callback()
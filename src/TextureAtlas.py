@@ -0,0 +1,72 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class TextureAtlas, a spritesheet sliced in one
+subsurface per frame, with the tile sprites baked from them.
+"""
+from typing import Dict, List, Tuple
+
+import pygame
+
+class TextureAtlas:
+    def __init__(
+        self, texture: pygame.Surface, rects: List[List[pygame.Rect]]
+    ) -> None:
+        self.texture = texture
+        # Area of each frame in the texture by [color][variety]
+        self.rects = rects
+        self.frames: List[List[pygame.Surface]] = []
+        # Frames composited with their shadows by (color, variety)
+        self.sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        self.__slice()
+
+    def __slice(self) -> None:
+        # The frames are subsurfaces, they share the pixels of the texture
+        self.frames = [
+            [self.texture.subsurface(rect) for rect in row] for row in self.rects
+        ]
+        self.sprites = self.__bake_sprites()
+
+    def __bake_sprites(self) -> Dict[Tuple[int, int], pygame.Surface]:
+        # Each frame composited with its shadow by (color, variety), so a tile
+        # is rendered with a single blit. The shadow is the shape of the tile
+        # filled with a dark color, two pixels down and to the right.
+        sprites = {}
+
+        for color, row in enumerate(self.frames):
+            for variety, frame in enumerate(row):
+                width, height = frame.get_size()
+                shadow = pygame.Surface((width, height), pygame.SRCALPHA)
+                shadow.blit(frame, (0, 0))
+                pygame.draw.rect(
+                    shadow,
+                    (34, 32, 52, 200),
+                    pygame.Rect(0, 0, width, height),
+                    border_radius=7,
+                )
+
+                sprite = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+                sprite.blit(shadow, (2, 2))
+                sprite.blit(frame, (0, 0))
+                sprites[(color, variety)] = sprite
+
+        return sprites
+
+    def convert(self) -> None:
+        # Converts the texture and the sprites to the pixel format of the
+        # display, so blitting them needs no conversion. The window must exist.
+        self.texture = self.texture.convert_alpha()
+        self.__slice()
+        self.sprites = {
+            key: sprite.convert_alpha() for key, sprite in self.sprites.items()
+        }
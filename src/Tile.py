@@ -13,8 +13,6 @@ lewis8a@gmail.com
 
 This file contains the class Tile.
 """
-import pygame
-
 import settings
 
 class Tile:
@@ -25,28 +23,5 @@ class Tile:
         self.y = self.i * settings.TILE_SIZE
         self.color = color
         self.variety = variety
-        self.alpha_surface = pygame.Surface(
-            (settings.TILE_SIZE, settings.TILE_SIZE), pygame.SRCALPHA
-        )
         self.powerup = False
-        self.active = False
-        self.type = 0
-
-    def render(self, surface: pygame.Surface, offset_x: int, offset_y: int) -> None:
-        self.alpha_surface.blit(
-            settings.TEXTURES["tiles"],
-            (0, 0),
-            settings.FRAMES["tiles"][self.color][self.variety],
-        )
-        pygame.draw.rect(
-            self.alpha_surface,
-            (34, 32, 52, 200),
-            pygame.Rect(0, 0, settings.TILE_SIZE, settings.TILE_SIZE),
-            border_radius=7,
-        )
-        surface.blit(self.alpha_surface, (self.x + 2 + offset_x, self.y + 2 + offset_y))
-        surface.blit(
-            settings.TEXTURES["tiles"],
-            (self.x + offset_x, self.y + offset_y),
-            settings.FRAMES["tiles"][self.color][self.variety],
-        )
\ No newline at end of file
+        self.type = 0
\ No newline at end of file
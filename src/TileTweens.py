@@ -0,0 +1,86 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the class TileTweens, the tweens of the tiles that fall in
+a cascade. The tiles of a step fall together, so they are kept in a batch with
+a single start time and duration, and flat arrays with the start heights and
+the distances of the tiles. Every frame computes the progress of each batch
+once and then moves its tiles in a plain loop over those arrays, instead of
+interpolating a dictionary of attributes for each tile as gale tweens do.
+"""
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from src.Tile import Tile
+
+
+class TweenBatch:
+    def __init__(
+        self,
+        start_time: float,
+        duration: float,
+        on_finish: Optional[Callable[[], None]],
+    ) -> None:
+        self.start_time = start_time
+        self.duration = duration
+        self.on_finish = on_finish
+        self.tiles: List[Tile] = []
+        self.start_y = array("d")
+        self.distance = array("d")
+
+
+class TileTweens:
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.batches: List[TweenBatch] = []
+
+    def add(
+        self,
+        targets: Sequence[Tuple[Tile, float]],
+        duration: float,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> None:
+        # Moves each tile from its current y to its target y in the given
+        # seconds, on_finish is called when all of them arrive.
+        batch = TweenBatch(self.time, duration, on_finish)
+
+        for tile, y in targets:
+            batch.tiles.append(tile)
+            batch.start_y.append(tile.y)
+            batch.distance.append(y - tile.y)
+
+        self.batches.append(batch)
+
+    def update(self, dt: float) -> None:
+        self.time += dt
+        finished = []
+
+        for batch in self.batches:
+            elapsed = self.time - batch.start_time
+            factor = 1.0 if elapsed >= batch.duration else elapsed / batch.duration
+
+            for tile, y, distance in zip(batch.tiles, batch.start_y, batch.distance):
+                tile.y = y + distance * factor
+
+            if factor == 1.0:
+                finished.append(batch)
+
+        if len(finished) > 0:
+            self.batches = [batch for batch in self.batches if batch not in finished]
+            # A callback may add the batch of the next step
+            for batch in finished:
+                if batch.on_finish is not None:
+                    batch.on_finish()
+
+    def clear(self) -> None:
+        self.batches.clear()
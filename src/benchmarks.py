@@ -0,0 +1,241 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the benchmarks of the board operations that run after every
+move, and the functions to run them and to compare their results against a
+baseline.
+
+Every case has a setup, which is not timed, and a run, which is timed. Both
+take the board of the benchmark, the setup returns the argument of the run.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import random
+import statistics
+import time
+
+from src import board_generator
+from src.BoardModel import BoardModel, POWERUP_COLOR, POWERUP_LINES
+
+Setup = Callable[[BoardModel], Any]
+Run = Callable[[Any], Any]
+
+# Boards generated at once by the board-generation case
+GENERATION_BATCH = 8
+
+
+def _paint_match(model: BoardModel, size: int, powerup: int = 0) -> BoardModel:
+    # Returns a copy of the board with a horizontal match of the given size in
+    # the middle row, with a power-up of the given kind in its first tile.
+    model = model.copy(random.Random(0))
+    i = model.height // 2
+    j = (model.width - size) // 2
+    color = model.colors[i * model.width + j]
+
+    for k in range(size):
+        model.set_cell(i * model.width + j + k, color, 0, powerup if k == 0 else 0)
+
+    return model
+
+
+def _matched(
+    model: BoardModel, powerup: int = 0
+) -> Tuple[BoardModel, List[List[int]]]:
+    model = _paint_match(model, 3, powerup)
+    return model, model.find_matches()
+
+
+def _resolved(model: BoardModel) -> BoardModel:
+    model, matches = _matched(model, POWERUP_COLOR)
+    model.resolve_matches(matches)
+    return model
+
+
+def _fallen(model: BoardModel) -> BoardModel:
+    model = _resolved(model)
+    model.apply_gravity()
+    return model
+
+
+def _swapped(model: BoardModel) -> Tuple[BoardModel, List[int]]:
+    model = model.copy(random.Random(0))
+    p, q = model.get_legal_moves()[0]
+    model.swap(p, q)
+    return model, [p, q]
+
+
+MODEL_CASES: Dict[str, Tuple[Setup, Run]] = {
+    "board-construction": (
+        lambda model: model,
+        lambda model: BoardModel(
+            model.width, model.height, model.num_colors, rng=random.Random(0)
+        ),
+    ),
+    "board-generation": (
+        lambda model: model,
+        lambda model: board_generator.generate_boards(
+            GENERATION_BATCH,
+            model.width,
+            model.height,
+            model.num_colors,
+            random.Random(0),
+            model.min_moves,
+        ),
+    ),
+    "find-matches": (
+        lambda model: _paint_match(model, 3),
+        lambda model: model.find_matches(),
+    ),
+    "find-matches-swap": (
+        _swapped,
+        lambda args: args[0].find_matches(args[1]),
+    ),
+    "resolve-matches": (
+        lambda model: _matched(model),
+        lambda args: args[0].resolve_matches(args[1]),
+    ),
+    "resolve-matches-lines": (
+        lambda model: _matched(model, POWERUP_LINES),
+        lambda args: args[0].resolve_matches(args[1]),
+    ),
+    "resolve-matches-color": (
+        lambda model: _matched(model, POWERUP_COLOR),
+        lambda args: args[0].resolve_matches(args[1]),
+    ),
+    "apply-gravity": (_resolved, lambda model: model.apply_gravity()),
+    # The move check that PlayState.can_play runs after every cascade. The
+    # search of the best move that it starts runs in a background thread and
+    # is not part of the frame, so it is not timed.
+    "get-hint": (_fallen, lambda model: model.get_hint()),
+}
+
+
+def render_cases() -> Dict[str, Tuple[Setup, Run]]:
+    # The render cases need pygame and the assets loaded by settings, so they
+    # are only built when requested.
+    import pygame
+
+    import settings
+    from src.Board import Board
+
+    def board_view(model: BoardModel) -> Tuple[Any, pygame.Surface]:
+        # The board profiles its model, so it takes a copy to keep the
+        # profiler out of the other cases
+        board = Board(0, 0, model.copy(random.Random(0)), random.Random(0))
+        surface = pygame.Surface(
+            (model.width * settings.TILE_SIZE, model.height * settings.TILE_SIZE)
+        )
+        # The first render builds the cached layer of the board
+        board.render(surface)
+        return board, surface
+
+    return {
+        "board-view": (
+            lambda model: model.copy(random.Random(0)),
+            lambda model: Board(0, 0, model, random.Random(0)),
+        ),
+        # The board draws each tile as a blit of its sprite from the atlas
+        "tile-render": (
+            board_view,
+            lambda args: args[1].blit(
+                settings.ATLASES["tiles"].sprites[
+                    (args[0].tiles[0][0].color, args[0].tiles[0][0].variety)
+                ],
+                (0, 0),
+            ),
+        ),
+        "board-render": (board_view, lambda args: args[0].render(args[1])),
+        "board-redraw": (
+            board_view,
+            lambda args: (args[0].invalidate(), args[0].render(args[1])),
+        ),
+    }
+
+
+def measure(
+    setup: Setup,
+    run: Run,
+    model: BoardModel,
+    min_time: float = 0.2,
+    min_runs: int = 5,
+    max_runs: int = 1000,
+) -> Dict[str, float]:
+    # Times the run until it took min_time seconds in total and ran at least
+    # min_runs times, and returns the statistics of the times in seconds.
+    times: List[float] = []
+
+    while len(times) < max_runs and (len(times) < min_runs or sum(times) < min_time):
+        args = setup(model)
+        start = time.perf_counter()
+        run(args)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def result_key(case: str, size: int, num_colors: int) -> str:
+    return f"{case}/{size}x{size}/{num_colors}"
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    num_colors: Sequence[int],
+    cases: Optional[Sequence[str]] = None,
+    render: bool = True,
+    seed: int = 0,
+    min_time: float = 0.2,
+    report: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Dict[str, Dict[str, float]]:
+    # Runs the cases on square boards of every size and number of colors and
+    # returns the statistics of each one by result_key.
+    all_cases = dict(MODEL_CASES)
+    if render:
+        all_cases.update(render_cases())
+    if cases is not None:
+        all_cases = {name: all_cases[name] for name in cases if name in all_cases}
+
+    results = {}
+
+    for size in sizes:
+        for colors in num_colors:
+            model = BoardModel(size, size, colors, rng=random.Random(seed))
+
+            for name, (setup, run) in all_cases.items():
+                key = result_key(name, size, colors)
+                results[key] = measure(setup, run, model, min_time)
+                if report is not None:
+                    report(key, results[key])
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = 1.2,
+) -> Dict[str, Tuple[float, bool]]:
+    # Ratio of the median of each result to the one in the baseline, and
+    # whether it is a regression, that is, the ratio is over the threshold.
+    ratios = {}
+
+    for key, result in results.items():
+        if key in baseline and baseline[key]["median"] > 0:
+            ratio = result["median"] / baseline[key]["median"]
+            ratios[key] = (ratio, ratio > threshold)
+
+    return ratios
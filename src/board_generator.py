@@ -0,0 +1,152 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the functions to generate boards of colors without matches
+and with a minimum number of available moves.
+"""
+from array import array
+from typing import List, Tuple
+
+import random
+
+from src import match_engine
+from src.BitBoard import BitBoard
+
+
+def _move_patterns() -> List[List[Tuple[int, int]]]:
+    # Three cells that become a line of three after a swap, as (di, dj)
+    # offsets: XX_X, X_XX and a line with one of its cells moved up or down.
+    patterns = [
+        [(0, 0), (0, 1), (0, 3)],
+        [(0, 0), (0, 2), (0, 3)],
+    ]
+    for gap in range(3):
+        for di in (-1, 1):
+            patterns.append([(0, dj) for dj in range(3) if dj != gap] + [(di, gap)])
+
+    # The vertical patterns are the transposed horizontal ones.
+    return patterns + [[(dj, di) for di, dj in pattern] for pattern in patterns]
+
+
+MOVE_PATTERNS = _move_patterns()
+
+
+def count_moves(bitboard: BitBoard) -> int:
+    right_moves, down_moves = 0, 0
+
+    for color in range(len(bitboard.masks)):
+        right, down = bitboard.color_moves(color)
+        right_moves |= right
+        down_moves |= down
+
+    return bin(right_moves).count("1") + bin(down_moves).count("1")
+
+
+def _fill(
+    colors: array, width: int, height: int, num_colors: int, rng: random.Random
+) -> None:
+    # Every cell takes a color that does not complete a line with the two
+    # cells on its left or the two cells above it, so no match is created.
+    for i in range(height):
+        for j in range(width):
+            p = i * width + j
+            banned = set()
+            if j >= 2 and colors[p - 1] == colors[p - 2]:
+                banned.add(colors[p - 1])
+            if i >= 2 and colors[p - width] == colors[p - 2 * width]:
+                banned.add(colors[p - width])
+
+            color = rng.randrange(num_colors - len(banned))
+            for b in sorted(banned):
+                if color >= b:
+                    color += 1
+            colors[p] = color
+
+
+def _plant_move(
+    colors: array,
+    bitboard: BitBoard,
+    width: int,
+    height: int,
+    num_colors: int,
+    rng: random.Random,
+) -> None:
+    # Paints one move pattern with a single color somewhere in the board and
+    # undoes it if that creates a match.
+    pattern = rng.choice(MOVE_PATTERNS)
+    min_i = -min(di for di, _ in pattern)
+    max_i = height - 1 - max(di for di, _ in pattern)
+    min_j = -min(dj for _, dj in pattern)
+    max_j = width - 1 - max(dj for _, dj in pattern)
+    if min_i > max_i or min_j > max_j:
+        return
+
+    i = rng.randint(min_i, max_i)
+    j = rng.randint(min_j, max_j)
+    color = rng.randrange(num_colors)
+
+    cells = [(i + di) * width + j + dj for di, dj in pattern]
+    previous = [colors[p] for p in cells]
+
+    for p in cells:
+        colors[p] = color
+
+    if any(match_engine.match_cells(colors, width, height, p) for p in cells):
+        for p, old_color in zip(cells, previous):
+            colors[p] = old_color
+        return
+
+    for p, old_color in zip(cells, previous):
+        bitboard.clear(p, old_color)
+        bitboard.set(p, color)
+
+
+def generate_colors(
+    width: int,
+    height: int,
+    num_colors: int,
+    rng: random.Random,
+    min_moves: int = 1,
+) -> array:
+    if num_colors < 3:
+        raise ValueError("At least 3 colors are needed to avoid initial matches")
+
+    colors = match_engine.new_grid(width, height)
+    _fill(colors, width, height, num_colors, rng)
+
+    bitboard = BitBoard(width, height, num_colors)
+    for p, color in enumerate(colors):
+        bitboard.set(p, color)
+
+    # Plant move patterns until the board has enough moves
+    attempts = 0
+    while count_moves(bitboard) < min_moves:
+        attempts += 1
+        if attempts > 100 * width * height:
+            raise ValueError(f"Could not generate a board with {min_moves} moves")
+        _plant_move(colors, bitboard, width, height, num_colors, rng)
+
+    return colors
+
+
+def generate_boards(
+    n: int,
+    width: int,
+    height: int,
+    num_colors: int,
+    rng: random.Random,
+    min_moves: int = 1,
+) -> List[array]:
+    return [
+        generate_colors(width, height, num_colors, rng, min_moves) for _ in range(n)
+    ]
@@ -0,0 +1,202 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the functions to calibrate the difficulty presets by
+simulating games played by a bot in a pool of processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from math import inf
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import random
+
+from src import solver
+from src.BoardModel import BoardModel
+
+# Seconds used by each part of a move in the game: the player thinking and
+# dragging the tile, and the tweens of the swap and of each cascade step.
+SECONDS_PER_MOVE = 2.0
+SECONDS_PER_TWEEN = 0.25
+
+# Levels after which a simulated game stops, the easy presets never end
+# otherwise.
+MAX_LEVELS = 10
+
+
+def simulate_game(config: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    # Plays a whole game with the preset in config, level after level as
+    # PlayState does, until the level timer runs out or the bot clears
+    # max-levels levels.
+    rng = random.Random(seed)
+
+    def new_board() -> BoardModel:
+        return BoardModel(
+            config["width"],
+            config["height"],
+            config["num-colors"],
+            rng=random.Random(rng.getrandbits(64)),
+            min_moves=config.get("min-moves", 1),
+        )
+
+    model = new_board()
+    level = 1
+    score = 0
+    timer = config["level-time"]
+    seconds = 0.0
+    moves = 0
+    dead_boards = 0
+
+    while timer > 0 and level <= config.get("max-levels", MAX_LEVELS):
+        move = solver.best_move(
+            model,
+            depth=config.get("bot-depth", 1),
+            samples=config.get("bot-samples", 1),
+            rng=rng,
+        )
+
+        # A board without moves is replaced and the timer keeps its value
+        if move is None:
+            dead_boards += 1
+            model = new_board()
+            continue
+
+        p, q = move
+        steps = model.play_powerup(p) if p == q else model.play_swap(p, q)
+        score += sum(step.score for step in steps)
+        moves += 1
+
+        elapsed = SECONDS_PER_MOVE + SECONDS_PER_TWEEN * (len(steps) + (p != q))
+        elapsed = min(elapsed, timer)
+        timer -= elapsed
+        seconds += elapsed
+
+        if timer > 0 and score >= level * 1.25 * config["goal-score"]:
+            level += 1
+            timer = config["level-time"]
+            model = new_board()
+
+    return {
+        "score": score,
+        "seconds": seconds,
+        "levels-cleared": level - 1,
+        "moves": moves,
+        "dead-boards": dead_boards,
+    }
+
+
+def _simulate(args: Sequence[Any]) -> Dict[str, Any]:
+    return simulate_game(*args)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    if len(values) == 0:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def summarize(config: Dict[str, Any], games: List[Dict[str, Any]]) -> Dict[str, Any]:
+    rates = [game["score"] / game["seconds"] for game in games if game["seconds"] > 0]
+    moves = sum(game["moves"] for game in games)
+
+    return {
+        "preset": {key: config[key] for key in ("goal-score", "level-time", "num-colors")},
+        "games": len(games),
+        "score-per-second": {
+            "mean": sum(rates) / len(rates) if len(rates) > 0 else 0.0,
+            "p10": _percentile(rates, 0.10),
+            "p50": _percentile(rates, 0.50),
+            "p90": _percentile(rates, 0.90),
+        },
+        "dead-board-rate": sum(game["dead-boards"] for game in games) / max(1, moves),
+        "level-clear-probability": sum(
+            1 for game in games if game["levels-cleared"] >= 1
+        ) / max(1, len(games)),
+        "mean-levels-cleared": sum(game["levels-cleared"] for game in games)
+        / max(1, len(games)),
+    }
+
+
+def calibrate(
+    goal_scores: Sequence[int],
+    level_times: Sequence[int],
+    num_colors: Sequence[int],
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    # Simulates the given number of games for every combination of the
+    # candidate values and returns the summary of each candidate.
+    configs = [
+        dict(options, **{"goal-score": g, "level-time": t, "num-colors": c})
+        for g, t, c in product(goal_scores, level_times, num_colors)
+    ]
+    seeds = random.Random(seed)
+    jobs = [
+        (config, seeds.getrandbits(64)) for config in configs for _ in range(games)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(_simulate, jobs, chunksize=max(1, games // 4))
+        )
+
+    return [
+        summarize(config, results[k * games : (k + 1) * games])
+        for k, config in enumerate(configs)
+    ]
+
+
+def choose_presets(
+    summaries: List[Dict[str, Any]], targets: Dict[str, float]
+) -> Dict[str, Dict[str, int]]:
+    # Gives each difficulty, from the easiest to the hardest, a different
+    # candidate, so that the probability of clearing the first level does not
+    # increase from one difficulty to the next. Among those assignments it
+    # picks the one with the smallest total distance to the targets.
+    names = list(targets)
+    if len(summaries) < len(names):
+        raise ValueError(f"At least {len(names)} candidates are needed")
+
+    ordered = sorted(
+        summaries, key=lambda summary: summary["level-clear-probability"], reverse=True
+    )
+    n = len(ordered)
+
+    # best[k][i]: smallest distance of the first k + 1 difficulties with the
+    # difficulty k in the candidate i, and the candidate of the difficulty
+    # k - 1 in that assignment
+    best: List[List[Tuple[float, int]]] = []
+
+    for k, name in enumerate(names):
+        row = []
+        for i in range(n):
+            distance = abs(ordered[i]["level-clear-probability"] - targets[name])
+            if i < k or n - i < len(names) - k:
+                row.append((inf, -1))
+            elif k == 0:
+                row.append((distance, -1))
+            else:
+                previous = min(range(k - 1, i), key=lambda h: best[k - 1][h][0])
+                row.append((best[k - 1][previous][0] + distance, previous))
+        best.append(row)
+
+    i = min(range(n), key=lambda h: best[-1][h][0])
+    presets = {}
+    for k in range(len(names) - 1, -1, -1):
+        presets[names[k]] = ordered[i]["preset"]
+        i = best[k][i][1]
+
+    return {name: presets[name] for name in names}
@@ -0,0 +1,163 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the function run_frame_benchmark, that runs the whole game
+for a number of frames of a fixed duration with a scripted player, and returns
+the time that the frames took by state.
+
+The player starts a game from the title, swaps tiles every few frames while
+playing and goes back to the title from the game over, so the frames go
+through the menus, the transitions, the swaps, the cascades and the game over.
+The SDL video and audio drivers should be the dummy ones, so no display is
+needed.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import random
+import statistics
+import time
+
+import pygame
+
+from gale.input_handler import InputData, InputHandler
+from gale.timer import Timer
+
+import settings
+from src import states
+from src.Board import Board
+from src.Match3 import Match3
+
+# Frames that the player waits in a menu before pressing enter
+MENU_FRAMES = 30
+
+
+class ScriptedPlayer:
+    def __init__(self, game: Match3, swap_interval: int, seed: int) -> None:
+        self.game = game
+        self.swap_interval = swap_interval
+        self.rng = random.Random(seed)
+        self.swaps = 0
+        self.__state = None
+        self.__frames = 0
+
+    def __notify(self, input_id: str, input_data: InputData) -> None:
+        for listener in list(InputHandler.listeners):
+            listener.on_input(input_id, input_data)
+
+    def __window_pos(self, board: Board, p: int) -> Tuple[int, int]:
+        # Position in the window of the center of the tile in p
+        i, j = divmod(p, board.model.width)
+        x, y = board.to_screen(
+            j * settings.TILE_SIZE + settings.TILE_SIZE // 2,
+            i * settings.TILE_SIZE + settings.TILE_SIZE // 2,
+        )
+        return (
+            x * settings.WINDOW_WIDTH // settings.VIRTUAL_WIDTH + 1,
+            y * settings.WINDOW_HEIGHT // settings.VIRTUAL_HEIGHT + 1,
+        )
+
+    def __swap(self, board: Board) -> None:
+        width = board.model.width
+        moves = [
+            (p, q)
+            for p, q in board.model.get_legal_moves()
+            if board.is_visible(*divmod(p, width))
+            and board.is_visible(*divmod(q, width))
+        ]
+        if len(moves) == 0:
+            return
+
+        p, q = self.rng.choice(moves)
+        self.__notify(
+            "click", InputData(pressed=True, position=self.__window_pos(board, p))
+        )
+        self.__notify("mouse_motion", InputData(position=self.__window_pos(board, q)))
+        self.__notify(
+            "click", InputData(released=True, position=self.__window_pos(board, q))
+        )
+        self.swaps += 1
+
+    def update(self) -> None:
+        # Sends the inputs of the current frame
+        state = self.game.state_machine.current
+        if state is not self.__state:
+            self.__state = state
+            self.__frames = 0
+        self.__frames += 1
+
+        if isinstance(state, (states.StartState, states.GameOverState)):
+            if self.__frames == MENU_FRAMES:
+                self.__notify("enter", InputData(pressed=True))
+        elif isinstance(state, states.PlayState):
+            if state.active and self.__frames % self.swap_interval == 0:
+                self.__swap(state.board)
+
+
+def run_frame_benchmark(
+    frames: int = 6000,
+    dt: float = 1 / 60,
+    swap_interval: int = 20,
+    seed: int = 0,
+    level_time: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    # Runs the frames and returns the statistics of their times in seconds by
+    # state, and of all of them by "all". A frame is the update of the
+    # timers and the game, the render and the presentation in the window.
+    if level_time is not None:
+        settings.CUSTOM_SETTINGS["level-time"] = level_time
+
+    game = Match3(
+        "Match 3",
+        settings.WINDOW_WIDTH,
+        settings.WINDOW_HEIGHT,
+        settings.VIRTUAL_WIDTH,
+        settings.VIRTUAL_HEIGHT,
+        seed=seed,
+    )
+    player = ScriptedPlayer(game, swap_interval, seed)
+    surface = pygame.Surface((settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT))
+    window = pygame.display.get_surface()
+
+    times: Dict[str, List[float]] = {}
+
+    for _ in range(frames):
+        state = type(game.state_machine.current).__name__
+        start = time.perf_counter()
+
+        player.update()
+        Timer.update(dt)
+        game.update(dt)
+        game.render(surface)
+        pygame.transform.scale(surface, window.get_size(), window)
+        pygame.display.flip()
+
+        times.setdefault(state, []).append(time.perf_counter() - start)
+
+    times["all"] = [t for state_times in times.values() for t in state_times]
+
+    results = {}
+    for state, state_times in times.items():
+        ordered = sorted(state_times)
+        total = sum(state_times)
+        results[state] = {
+            "frames": len(state_times),
+            "total": total,
+            "fps": len(state_times) / total if total > 0 else 0.0,
+            "median": statistics.median(ordered),
+            "mean": statistics.mean(ordered),
+            "p95": ordered[round((len(ordered) - 1) * 0.95)],
+            "max": ordered[-1],
+        }
+    results["all"]["swaps"] = player.swaps
+
+    return results
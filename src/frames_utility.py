@@ -11,7 +11,7 @@ marquezberriosk@gmail.com
 Author: Lewis Ochoa
 lewis8a@gmail.com
 
-This file contains a function to fetch and store the tile frames.
+This file contains the functions to fetch and store the tile frames.
 """
 from typing import List
 
@@ -45,4 +45,4 @@ def generate_tile_frames(spritesheet: pygame.Surface) -> List[List[pygame.Rect]]
         y += settings.TILE_SIZE
         x = 0
 
-    return frames
\ No newline at end of file
+    return frames
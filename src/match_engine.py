@@ -0,0 +1,107 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the functions to find matches on a flat grid of colors.
+The grid stores the color of the cell (i, j) at the position i * width + j
+and EMPTY for the cells without tile.
+"""
+from array import array
+from typing import Dict, List, Optional
+
+EMPTY = -1
+
+
+def new_grid(width: int, height: int) -> array:
+    return array("b", [EMPTY]) * (width * height)
+
+
+def group_runs(runs: List[List[int]]) -> List[List[int]]:
+    # Runs that share a cell (L, T and + shapes) belong to the same match.
+    groups: List[Optional[List[int]]] = []
+    owner: Dict[int, int] = {}
+
+    for run in runs:
+        merged = {owner[p] for p in run if p in owner}
+        target = min(merged) if merged else len(groups)
+
+        if not merged:
+            groups.append([])
+
+        for g in merged:
+            if g == target:
+                continue
+            for p in groups[g]:
+                owner[p] = target
+            groups[target] += groups[g]
+            groups[g] = None
+
+        for p in run:
+            if p not in owner:
+                owner[p] = target
+                groups[target].append(p)
+
+    return [group for group in groups if group is not None]
+
+
+def match_cells(grid: array, width: int, height: int, p: int) -> List[int]:
+    # Cells of the horizontal and vertical runs of three or more through p.
+    color = grid[p]
+    if color == EMPTY:
+        return []
+
+    i, j = divmod(p, width)
+    cells: List[int] = []
+
+    left = j
+    while left > 0 and grid[p - (j - left) - 1] == color:
+        left -= 1
+    right = j
+    while right < width - 1 and grid[p + (right - j) + 1] == color:
+        right += 1
+    if right - left >= 2:
+        cells += [i * width + k for k in range(left, right + 1) if k != j]
+
+    top = i
+    while top > 0 and grid[p - (i - top + 1) * width] == color:
+        top -= 1
+    bottom = i
+    while bottom < height - 1 and grid[p + (bottom - i + 1) * width] == color:
+        bottom += 1
+    if bottom - top >= 2:
+        cells += [k * width + j for k in range(top, bottom + 1) if k != i]
+
+    if len(cells) > 0:
+        cells.append(p)
+
+    return cells
+
+
+def swap_match_cells(
+    grid: array, width: int, height: int, p: int, q: int
+) -> List[int]:
+    # Cells that would match if the tiles in p and q were swapped, given by
+    # their position before the swap.
+    if grid[p] == grid[q]:
+        return []
+
+    grid[p], grid[q] = grid[q], grid[p]
+    cells = set(match_cells(grid, width, height, p))
+    cells.update(match_cells(grid, width, height, q))
+    grid[p], grid[q] = grid[q], grid[p]
+
+    return [q if c == p else p if c == q else c for c in cells]
+
+
+def swap_makes_match(grid: array, width: int, height: int, p: int, q: int) -> bool:
+    return len(swap_match_cells(grid, width, height, p, q)) > 0
+
@@ -0,0 +1,76 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the functions to build the backdrop of the menus: a board
+of random tiles with their shadows and the darkening of the screen, rendered
+once and shared by StartState and SettingsState.
+"""
+from typing import Optional
+
+import pygame
+
+import settings
+
+_backdrop: Optional[pygame.Surface] = None
+
+
+def build_menu_backdrop() -> pygame.Surface:
+    # Renders a new backdrop with other random tiles
+    global _backdrop
+
+    _backdrop = pygame.Surface(
+        (settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT), pygame.SRCALPHA
+    )
+
+    # A surface that supports alpha for each tile to draw
+    tile_alpha_surface = pygame.Surface(
+        (settings.TILE_SIZE, settings.TILE_SIZE), pygame.SRCALPHA
+    )
+    pygame.draw.rect(
+        tile_alpha_surface,
+        (0, 0, 0, 255),
+        pygame.Rect(0, 0, settings.TILE_SIZE, settings.TILE_SIZE),
+        border_radius=7,
+    )
+
+    # Render all the tiles and their shadows
+    for i in range(settings.VIEWPORT_HEIGHT):
+        for j in range(settings.VIEWPORT_WIDTH):
+            color = settings.RNG.randint(0, settings.CUSTOM_SETTINGS["num-colors"] - 1)
+            variety = settings.RNG.randint(0, settings.NUM_VARIETIES - 1)
+            frame = settings.ATLASES["tiles"].frames[color][variety]
+
+            x = j * settings.TILE_SIZE + 128
+            y = i * settings.TILE_SIZE + 16
+
+            _backdrop.blit(frame, (x + 2, y + 2))
+            _backdrop.blit(tile_alpha_surface, (x + 2, y + 2))
+            _backdrop.blit(frame, (x, y))
+
+    # keep the background and tiles a little darker than normal
+    screen_alpha_surface = pygame.Surface(
+        (settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT), pygame.SRCALPHA
+    )
+    screen_alpha_surface.fill((0, 0, 0, 128))
+    _backdrop.blit(screen_alpha_surface, (0, 0))
+
+    if pygame.display.get_surface() is not None:
+        _backdrop = _backdrop.convert_alpha()
+
+    return _backdrop
+
+
+def get_menu_backdrop() -> pygame.Surface:
+    # Returns the current backdrop, so the menus reached from another menu
+    # show the same tiles
+    return _backdrop if _backdrop is not None else build_menu_backdrop()
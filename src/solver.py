@@ -0,0 +1,137 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the functions to search the best moves of a board. A move
+is a pair (p, q) of flat positions: the swap of p and q, or the activation of
+the power-up in p when p == q. The refills are random, so every move is
+evaluated as the average over several samples of them (expectimax).
+"""
+from typing import List, Optional, Tuple
+
+import random
+import time
+
+from src import match_engine
+from src.BoardModel import BoardModel
+
+Move = Tuple[int, int]
+
+
+class _Timeout(Exception):
+    pass
+
+
+def legal_moves(model: BoardModel) -> List[Move]:
+    return model.get_legal_moves() + [(p, p) for p in sorted(model.powerup_cells)]
+
+
+def play_move(model: BoardModel, move: Move) -> int:
+    # Plays the move in the board and returns the score of its cascade.
+    p, q = move
+    steps = model.play_powerup(p) if p == q else model.play_swap(p, q)
+    return sum(step.score for step in steps) if steps is not None else 0
+
+
+def move_hint(model: BoardModel, move: Move) -> List[int]:
+    # Cells to highlight to suggest the move
+    p, q = move
+    if p == q:
+        return [p]
+    return match_engine.swap_match_cells(model.colors, model.width, model.height, p, q)
+
+
+def _expected_score(
+    model: BoardModel,
+    move: Move,
+    depth: int,
+    samples: int,
+    rng: random.Random,
+    deadline: Optional[float],
+) -> float:
+    total = 0.0
+
+    for _ in range(samples):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise _Timeout()
+
+        child = model.copy(random.Random(rng.getrandbits(64)))
+        total += play_move(child, move)
+
+        if depth > 1:
+            total += _best_score(child, depth - 1, samples, rng, deadline)
+
+    return total / samples
+
+
+def _best_score(
+    model: BoardModel,
+    depth: int,
+    samples: int,
+    rng: random.Random,
+    deadline: Optional[float],
+) -> float:
+    return max(
+        (
+            _expected_score(model, move, depth, samples, rng, deadline)
+            for move in legal_moves(model)
+        ),
+        default=0.0,
+    )
+
+
+def rank_moves(
+    model: BoardModel,
+    depth: int = 1,
+    samples: int = 4,
+    time_budget: Optional[float] = None,
+    rng: Optional[random.Random] = None,
+    moves: Optional[List[Move]] = None,
+) -> List[Tuple[Move, float]]:
+    # Returns the given moves, or all the legal ones, with their expected
+    # score, best first. The search goes one level deeper at a time while the
+    # time budget (in seconds) allows it. When the budget runs out in the
+    # first level, only the moves scored so far are returned, or the first
+    # move when none was.
+    rng = rng if rng is not None else random.Random()
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    moves = moves if moves is not None else legal_moves(model)
+    ranked: List[Tuple[Move, float]] = []
+
+    for level in range(1, depth + 1):
+        scored: List[Tuple[Move, float]] = []
+        try:
+            for move in moves:
+                scored.append(
+                    (move, _expected_score(model, move, level, samples, rng, deadline))
+                )
+        except _Timeout:
+            if level == 1:
+                ranked = scored if len(scored) > 0 else [(moves[0], 0.0)]
+                ranked.sort(key=lambda item: item[1], reverse=True)
+            break
+
+        ranked = sorted(scored, key=lambda item: item[1], reverse=True)
+
+    return ranked
+
+
+def best_move(
+    model: BoardModel,
+    depth: int = 1,
+    samples: int = 4,
+    time_budget: Optional[float] = None,
+    rng: Optional[random.Random] = None,
+    moves: Optional[List[Move]] = None,
+) -> Optional[Move]:
+    ranked = rank_moves(model, depth, samples, time_budget, rng, moves)
+    return ranked[0][0] if len(ranked) > 0 else None
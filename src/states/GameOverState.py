@@ -17,9 +17,9 @@ import pygame
 
 from gale.input_handler import InputHandler, InputData
 from gale.state_machine import BaseState
-from gale.text import render_text
 
 import settings
+from src.text_cache import render_text
 
 class GameOverState(BaseState):
     def enter(self, score: int) -> None:
@@ -18,11 +18,11 @@ from typing import Dict, Any
 import pygame
 
 from gale.state_machine import BaseState
-from gale.text import render_text
 from gale.timer import Timer
 
 import settings
 from src.Board import Board
+from src.text_cache import render_text
 
 class NewBoardState(BaseState):
     def enter(self, **enter_params: Dict[str, Any]) -> None:
@@ -54,8 +54,8 @@ class NewBoardState(BaseState):
             on_finish=lambda: Timer.tween(
                 0.25,
                 [(self, {"level_label_y": settings.VIRTUAL_HEIGHT // 2 - 30})],
-                # after that, pause for 1.5 second with Timer.after
-                on_finish=lambda: Timer.after(
+                # after that, pause for 1.5 second with the scheduler
+                on_finish=lambda: settings.SCHEDULER.after(
                     1.5,
                     # Then, animate the label going down past the bottom edge
                     lambda: Timer.tween(
@@ -70,6 +70,7 @@ class NewBoardState(BaseState):
                             timer=self.timer,
                         ),
                     ),
+                    group=self,
                 ),
             ),
         )
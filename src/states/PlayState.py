@@ -13,21 +13,22 @@ lewis8a@gmail.com
 
 This file contains the class PlayState.
 """
-from typing import Dict, Any, List, Set, NoReturn, Tuple
-from copy import deepcopy
+from typing import Dict, Any, List, NoReturn, Tuple
 
 import pygame
 
 from gale.input_handler import InputHandler, InputData
 from gale.state_machine import BaseState
-from gale.text import render_text
 from gale.timer import Timer
 
 import settings
-from src.Tile import Tile
-from src.Board import Board
+from src.BoardModel import CascadeStep
+from src.text_cache import render_text
 
 class PlayState(BaseState):
+    # Tiles scrolled by each input
+    SCROLL_DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
     def enter(self, **enter_params: Dict[str, Any]) -> NoReturn:
         self.level = enter_params["level"]
         self.board = enter_params["board"]
@@ -48,8 +49,6 @@ class PlayState(BaseState):
         self.hint_timer = settings.HINT_TIME
         self.hint_tiles = []
 
-        self.tiles_in_match = []
-
         # A surface that supports alpha to highlight a selected tile
         self.tile_alpha_surface = pygame.Surface(
             (settings.TILE_SIZE, settings.TILE_SIZE), pygame.SRCALPHA
@@ -88,26 +87,39 @@ class PlayState(BaseState):
             if self.timer <= 5:
                 settings.SOUNDS["clock"].play()
         
-        Timer.every(1, decrement_timer)
+        settings.SCHEDULER.every(1, decrement_timer, group=self, name="level")
         
         def increment_hint_timer():
             self.hint_timer += 1
 
-        Timer.every(1, increment_hint_timer)
+            # The best move replaces the first one found when the hint is
+            # shown, if its search is over
+            if self.hint_timer == 10 and self.active:
+                cells = self.board.get_best_hint()
+                if cells is not None:
+                    self.__set_hint(cells)
+
+        settings.SCHEDULER.every(1, increment_hint_timer, group=self, name="hint")
 
         InputHandler.register_listener(self)
 
     def exit(self) -> NoReturn:
         InputHandler.unregister_listener(self)
 
-    def update(self, _: float) -> NoReturn:
+    def update(self, dt: float) -> NoReturn:
+        self.board.update(dt)
+
         if self.timer <= 0:
+            # Stops the tweens in flight, the timers of the state are
+            # cancelled by the state machine
             Timer.clear()
+            self.board.falls.clear()
             settings.SOUNDS["game-over"].play()
             self.state_machine.change("game-over", score=self.score)
 
         if self.score >= self.goal_score:
             Timer.clear()
+            self.board.falls.clear()
             settings.SOUNDS["next-level"].play()
             self.state_machine.change("begin", level=self.level + 1, score=self.score)
 
@@ -115,6 +127,7 @@ class PlayState(BaseState):
         # Change a NewBoardState for generating a new board
         if self.reboot_board:
             Timer.clear()
+            self.board.falls.clear()
             self.state_machine.change(
                 "newboard",
                 level=self.level,
@@ -124,20 +137,27 @@ class PlayState(BaseState):
              
         self.board.render(surface)
 
+        # The highlights are drawn only in the visible part of the board
+        clip = surface.get_clip()
+        surface.set_clip(self.board.get_viewport())
+
         if self.highlighted_tile:
-            x = self.highlighted_j1 * settings.TILE_SIZE + self.board.x
-            y = self.highlighted_i1 * settings.TILE_SIZE + self.board.y
+            x, y = self.board.to_screen(
+                self.highlighted_j1 * settings.TILE_SIZE,
+                self.highlighted_i1 * settings.TILE_SIZE,
+            )
             surface.blit(self.tile_alpha_surface, (x, y))
 
         if self.hint_timer > 10:
             for pos_tile in self.hint_tiles:
-                x = pos_tile['x'] + self.board.x
-                y = pos_tile['y'] + self.board.y
+                x, y = self.board.to_screen(pos_tile['x'], pos_tile['y'])
                 if self.timer % 2 == 0:
                     surface.blit(self.hint_alpha_surface, (x, y))
                 else:
                     surface.blit(self.tile_alpha_surface, (x, y))
 
+        surface.set_clip(clip)
+
         
         surface.blit(self.text_alpha_surface, (16, 16))
         render_text(
@@ -180,13 +200,19 @@ class PlayState(BaseState):
     def on_input(self, input_id: str, input_data: InputData) -> NoReturn:
         if not self.active:
             return
+
+        # Scroll the boards larger than the screen
+        if input_id in self.SCROLL_DIRECTIONS and input_data.pressed:
+            if not self.highlighted_tile:
+                dx, dy = self.SCROLL_DIRECTIONS[input_id]
+                self.board.scroll(dx * settings.TILE_SIZE, dy * settings.TILE_SIZE)
         
         if input_id == "click":
             
             pos_x, pos_y = self.__to_virtual_pos(input_data)
             i, j = self.__to_index(pos_x, pos_y)
 
-            if 0 <= i < settings.BOARD_HEIGHT and 0 <= j <= settings.BOARD_WIDTH:
+            if self.__in_view(input_data):
                 if input_data.pressed and not self.highlighted_tile:
                     self.highlighted_tile = True
                     self.highlighted_i1 = i
@@ -194,35 +220,33 @@ class PlayState(BaseState):
                
                 elif input_data.released and self.highlighted_tile:
                     tile1 = self.board.tiles[self.highlighted_i1][self.highlighted_j1]
-                    
-                    # Valid movement
-                    self.active = False
                     tile2 = self.board.tiles[i][j]
-                    self.__swap_tiles(tile1, tile2)
-                    matches = self.__get_matches([tile1, tile2])
-                    
-                    def before_matched():
-                        self.tiles_in_match = []
-                        self.tiles_in_match.append(tile1)
-                        self.tiles_in_match.append(tile2)
-                        self.__solve_matches(matches)
-                    
+                    steps = self.board.swap_tiles(tile1, tile2)
+
+                    # Reset on input for acepting entries
+                    self.__reset_input()
+
                     # Swap tiles
-                    if matches is not None:
-                        self.hint_tiles = []
+                    if steps is not None:
+                        # Wait for the cascade to be played
+                        self.active = False
                         self.hint_timer = 0
+
+                        # The board is already in its final state, so the hint
+                        # is ready while the cascade is animated
+                        self.can_play()
                         Timer.tween(
                             0.25,
                             [
-                                (tile1, {"x": tile2.x, "y": tile2.y}),
-                                (tile2, {"x": self.highlighted_j1 * settings.TILE_SIZE,
-                                        "y": self.highlighted_i1 * settings.TILE_SIZE}),
+                                (tile1, {"x": tile1.j * settings.TILE_SIZE,
+                                         "y": tile1.i * settings.TILE_SIZE}),
+                                (tile2, {"x": tile2.j * settings.TILE_SIZE,
+                                         "y": tile2.i * settings.TILE_SIZE}),
                             ],
-                            on_finish=before_matched,
+                            on_finish=lambda: self.__play_cascade(steps),
                         )
                     # Get back highlighted tile (No match)
                     else:
-                        self.__swap_tiles(tile2, tile1)
                         Timer.tween(
                             0.15,
                             [
@@ -231,8 +255,6 @@ class PlayState(BaseState):
                                 ),
                             ],
                         )
-                    # Reset on input for acepting entries
-                    self.__reset_input()                         
                 
         # Draggin tile selected
         elif input_id == "mouse_motion" and self.highlighted_tile:
@@ -242,6 +264,7 @@ class PlayState(BaseState):
             
             # Valid movement
             if (di < 2 and dj == 0) or (dj < 2 and di == 0):
+                self.board.lift(self.board.tiles[self.highlighted_i1][self.highlighted_j1])
                 self.board.tiles[self.highlighted_i1][self.highlighted_j1].x = pos_x - settings.TILE_SIZE / 2
                 self.board.tiles[self.highlighted_i1][self.highlighted_j1].y =  pos_y - settings.TILE_SIZE / 2
 
@@ -260,30 +283,13 @@ class PlayState(BaseState):
         if input_id == "click3":
             pos_x, pos_y = self.__to_virtual_pos(input_data)
             i, j = self.__to_index(pos_x, pos_y)
-            if 0 <= i < settings.BOARD_HEIGHT and 0 <= j <= settings.BOARD_WIDTH and input_data.released:
+            if self.__in_view(input_data) and input_data.released:
                 if self.board.tiles[i][j].powerup == True:
-                    self.hint_tiles = []
-                    self.board.tiles[i][j].active = True
-                    settings.SOUNDS["explosion"].stop()
-                    settings.SOUNDS["explosion"].play()
-                    self.board.matches.append([self.board.tiles[i][j]])
-                    self.score += self.board.remove_matches() * 50
-                    falling_tiles = self.board.get_falling_tiles()
-
-                    def recal_matches():
-                        matches = self.__get_matches([item[0] for item in falling_tiles])
-                        if matches is not None:
-                            self.__solve_matches(matches)
-                        
-                        # Check if exits almost one move
-                        if not self.can_play():
-                            self.reboot_board = True                           
-                    
-                    Timer.tween(
-                        0.25,
-                        falling_tiles,
-                        on_finish=recal_matches,
-                    )
+                    self.active = False
+                    self.hint_timer = 0
+                    steps = self.board.activate_powerup(self.board.tiles[i][j])
+                    self.can_play()
+                    self.__play_cascade(steps)
     
     def __get_index_delta(self, i1: int, j1: int, i2:int, j2:int) -> Tuple[int, int]:
         di = abs(i1 - i2)
@@ -294,134 +300,67 @@ class PlayState(BaseState):
         self.active = True
         self.highlighted_tile = False
     
-    def __swap_tiles(self, tile1: Tile, tile2: Tile) -> NoReturn:
-        (self.board.tiles[tile1.i][tile1.j], self.board.tiles[tile2.i][tile2.j],) = (
-            self.board.tiles[tile2.i][tile2.j],
-            self.board.tiles[tile1.i][tile1.j],
-        )
-        tile1.i, tile1.j, tile2.i, tile2.j = ( tile2.i, tile2.j, tile1.i, tile1.j,)
-    
-    def __to_virtual_pos(self, input_data: InputData) -> Tuple[int, int]:
+    def __to_screen_pos(self, input_data: InputData) -> Tuple[int, int]:
         pos_x, pos_y = input_data.position
-        pos_x = pos_x * settings.VIRTUAL_WIDTH // settings.WINDOW_WIDTH - self.board.x
-        pos_y = pos_y * settings.VIRTUAL_HEIGHT // settings.WINDOW_HEIGHT - self.board.y
-        
+        pos_x = pos_x * settings.VIRTUAL_WIDTH // settings.WINDOW_WIDTH
+        pos_y = pos_y * settings.VIRTUAL_HEIGHT // settings.WINDOW_HEIGHT
+
         return pos_x, pos_y
 
+    def __to_virtual_pos(self, input_data: InputData) -> Tuple[int, int]:
+        # Position in the board, including its scroll
+        return self.board.to_board(*self.__to_screen_pos(input_data))
+
+    def __in_view(self, input_data: InputData) -> bool:
+        x, y = self.__to_screen_pos(input_data)
+        return (
+            self.board.x <= x < self.board.x + self.board.view_width
+            and self.board.y <= y < self.board.y + self.board.view_height
+        )
+
     def __to_index(self, x: int, y: int)-> Tuple[int, int]:
         i = y // settings.TILE_SIZE
         j = x // settings.TILE_SIZE
 
         return i, j
 
-    def __get_matches(self, tiles: List) -> Set[Tile]:
-        return self.board.calculate_matches_for(tiles)
-    
-    def __solve_matches(self, matches: Set[Tile]) -> NoReturn:
-        settings.SOUNDS["match"].stop()
-        settings.SOUNDS["match"].play()
-
-        for match in matches:
-            size_m = len(match)
-            for tile in match:
-                if tile.powerup:
-                    tile.active = True
-                if size_m == 4 and tile.powerup == False:
-                    if tile == self.tiles_in_match[0]:
-                        self.tiles_in_match[0].powerup = True
-                        self.tiles_in_match[0].variety = self.tiles_in_match[0].variety + 5
-                        self.tiles_in_match[0].type = 1
-                        settings.SOUNDS["powerup1"].stop()
-                        settings.SOUNDS["powerup1"].play()
-
-                    elif tile == self.tiles_in_match[1]:
-                        self.tiles_in_match[1].powerup = True
-                        self.tiles_in_match[1].variety = self.tiles_in_match[1].variety + 5
-                        self.tiles_in_match[1].type = 1
-                        settings.SOUNDS["powerup1"].stop()
-                        settings.SOUNDS["powerup1"].play()
-
-                if size_m >= 5:
-                    if tile == self.tiles_in_match[0]:
-                        self.tiles_in_match[0].powerup = True
-                        self.tiles_in_match[0].variety = self.tiles_in_match[0].variety + 1
-                        self.tiles_in_match[0].type = 2
-                        settings.SOUNDS["powerup2"].stop()
-                        settings.SOUNDS["powerup2"].play()
-
-                    elif tile == self.tiles_in_match[1]:
-                        self.tiles_in_match[1].powerup = True
-                        self.tiles_in_match[1].variety = self.tiles_in_match[1].variety + 1
-                        self.tiles_in_match[1].type = 2
-                        settings.SOUNDS["powerup2"].stop()
-                        settings.SOUNDS["powerup2"].play()
-            
-            if not self.tiles_in_match[0].powerup and not self.tiles_in_match[1].powerup:
-                if size_m == 4:
-                    match[0].powerup = True
-                    match[0].variety = match[0].variety + 5
-                    match[0].type = 1
-                    settings.SOUNDS["powerup2"].stop()
-                    settings.SOUNDS["powerup2"].play()
-                
-                elif size_m >= 5:
-                    match[0].powerup = True
-                    match[0].variety = match[0].variety + 1
-                    match[0].type = 2
-                    settings.SOUNDS["powerup2"].stop()
-                    settings.SOUNDS["powerup2"].play()
-
-        self.score += self.board.remove_matches() * 50
-        falling_tiles = self.board.get_falling_tiles()
-
-        def recal_matches():
-            matches = self.__get_matches([item[0] for item in falling_tiles])
-            if matches is not None:
-                self.__solve_matches(matches)
-            
+    def __play_cascade(self, steps: List[CascadeStep]) -> NoReturn:
+        # Plays the steps of a cascade resolved by the board, one per tween
+        if len(steps) == 0:
+            self.active = True
+
             # Check if exits almost one move
-            if not self.can_play():
+            if len(self.hint_tiles) == 0:
                 self.reboot_board = True
-        
-        Timer.tween(
+            return
+
+        step = steps[0]
+
+        if len(step.matches) > 0:
+            settings.SOUNDS["match"].stop()
+            settings.SOUNDS["match"].play()
+
+        for _, kind, _ in step.powerups:
+            sound = settings.SOUNDS[f"powerup{kind}"]
+            sound.stop()
+            sound.play()
+
+        self.score += step.score
+
+        self.board.falls.add(
+            self.board.apply_step(step),
             0.25,
-            falling_tiles,
-            on_finish=recal_matches,
+            on_finish=lambda: self.__play_cascade(steps[1:]),
         )
 
-    def can_play(self) -> bool:
-        if len(self.hint_tiles) > 0:
-            return True
-        
-        for j in range(settings.BOARD_WIDTH - 1):
-            for i in range(settings.BOARD_HEIGHT - 1):
-                if self.is_there_movement(i,j):
-                    return True
+    def __set_hint(self, cells: List[Tuple[int, int]]) -> NoReturn:
+        self.hint_tiles = [
+            {"x": j * settings.TILE_SIZE, "y": i * settings.TILE_SIZE}
+            for i, j in cells
+        ]
 
-        return False
-    
-    def is_there_movement(self, i: int, j: int) -> bool:
-        return self.__is_there_movement(i,j,1,0) or self.__is_there_movement(i,j,0,1)
-    
-    def __is_there_movement(self, i: int, j: int, left: int, down: int) -> bool:
-        tile1 = self.board.tiles[i][j]
-        tile2 = self.board.tiles[i + down][j + left]
-        if tile1.powerup:
-            self.hint_tiles = [{"x": tile1.x, "y": tile1.y}]
-            self.hint_tiles = deepcopy(self.hint_tiles)
-            return True
-        elif tile2.powerup:
-            self.hint_tiles = [{"x": tile2.x, "y": tile2.y}]
-            self.hint_tiles = deepcopy(self.hint_tiles)
-            return True
-            
-        self.__swap_tiles(tile1, tile2)
-        matches = self.__get_matches([tile1, tile2])
-        self.__swap_tiles(tile1, tile2)
-        if matches is not None: 
-            self.hint_tiles = [{"x": tiles.x, "y": tiles.y} for row in matches for tiles in row]
-            self.hint_tiles = deepcopy(self.hint_tiles)
-            self.board.matches = []
-            return True
-        
-        return False
\ No newline at end of file
+    def can_play(self) -> bool:
+        self.__set_hint(self.board.get_hint())
+        # The best move is searched in the background to be shown instead
+        self.board.search_best_hint(settings.HINT_SEARCH_TIME)
+        return len(self.hint_tiles) > 0
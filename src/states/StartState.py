@@ -13,16 +13,15 @@ lewis8a@gmail.com
 
 This file contains the class StartState.
 """
-import random
-
 import pygame
 
 from gale.input_handler import InputHandler, InputData
 from gale.state_machine import BaseState, StateMachine
-from gale.text import render_text
 from gale.timer import Timer
 
 import settings
+from src.menu_backdrop import build_menu_backdrop
+from src.text_cache import render_text
 
 class StartState(BaseState):
     # colors we'll use to change the title text
@@ -38,9 +37,6 @@ class StartState(BaseState):
     # letters of MATCH 3 and their spacing relative to the center
     LETTER_TABLE = {"M": -108, "A": -64, "T": -28, "C": 2, "H": 40, "3": 112}
 
-    # A list of frames just for display.
-    frames = []
-
     def __init__(self, state_machine: StateMachine, game) -> None:
         super().__init__(state_machine)
         self.game = game
@@ -56,32 +52,18 @@ class StartState(BaseState):
 
             self.colors[0] = last
 
-        self.color_timer = Timer.every(0.075, shift_colors)
+        self.color_timer = settings.SCHEDULER.every(0.075, shift_colors, group=self)
 
         self.alpha_transition = 0
 
-        # Generate the full tile list for display
-        for _ in range(settings.BOARD_WIDTH * settings.BOARD_HEIGHT):
-            color = random.randint(0, settings.CUSTOM_SETTINGS["num-colors"] - 1)
-            variety = random.randint(0, settings.NUM_VARIETIES - 1)
-            self.frames.append(settings.FRAMES["tiles"][color][variety])
+        # Tiles for display, shared with the other menu
+        self.backdrop = build_menu_backdrop()
 
         # A surface that supports alpha for the screen
         self.screen_alpha_surface = pygame.Surface(
             (settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT), pygame.SRCALPHA
         )
 
-        # A surface that supports alpha for each tile to draw
-        self.tile_alpha_surface = pygame.Surface(
-            (settings.TILE_SIZE, settings.TILE_SIZE), pygame.SRCALPHA
-        )
-        pygame.draw.rect(
-            self.tile_alpha_surface,
-            (0, 0, 0, 255),
-            pygame.Rect(0, 0, settings.TILE_SIZE, settings.TILE_SIZE),
-            border_radius=7,
-        )
-
         # A surface that supports alpha for the title and the menu
         self.text_alpha_surface = pygame.Surface((300, 58), pygame.SRCALPHA)
         self.text_alpha_surface2 = pygame.Surface((300, 98), pygame.SRCALPHA)
@@ -102,30 +84,8 @@ class StartState(BaseState):
         InputHandler.unregister_listener(self)
 
     def render(self, surface: pygame.Surface) -> None:
-        # Render all the tiles and their shadows
-        for i in range(settings.BOARD_HEIGHT):
-            for j in range(settings.BOARD_HEIGHT):
-                x = j * settings.TILE_SIZE + 128
-                y = i * settings.TILE_SIZE + 16
-
-                # Frame position in the list
-                f = i * settings.BOARD_HEIGHT + j
-
-                surface.blit(settings.TEXTURES["tiles"], (x + 2, y + 2), self.frames[f])
-                surface.blit(self.tile_alpha_surface, (x + 2, y + 2))
-                surface.blit(
-                    settings.TEXTURES["tiles"],
-                    (x, y),
-                    self.frames[i * settings.BOARD_HEIGHT + j],
-                )
-
-        # keep the background and tiles a little darker than normal
-        pygame.draw.rect(
-            self.screen_alpha_surface,
-            (0, 0, 0, 128),
-            pygame.Rect(0, 0, settings.VIRTUAL_WIDTH, settings.VIRTUAL_HEIGHT),
-        )
-        surface.blit(self.screen_alpha_surface, (0, 0))
+        # The tiles, their shadows and the darkening are in the backdrop
+        surface.blit(self.backdrop, (0, 0))
         self.__draw_match3_text(surface, -60)
         self.__draw_options(surface, 12)
 
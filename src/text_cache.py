@@ -0,0 +1,94 @@
+"""
+ISPPJ1 2023
+Study Case: Match-3
+
+Author: Alejandro Mujica
+alejandro.j.mujic4@gmail.com
+
+Author: Kevin Márquez
+marquezberriosk@gmail.com
+
+Author: Lewis Ochoa
+lewis8a@gmail.com
+
+This file contains the function render_text, a replacement of the one in
+gale.text that keeps the rendered texts in a cache, so a text that does not
+change is not rasterized again every frame.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pygame
+
+from gale import text
+
+# Texts kept in the cache, the least recently used ones are dropped first
+MAX_ENTRIES = 256
+
+# Room around the text for its shadow
+MARGIN = 4
+
+Color = Tuple[int, int, int]
+
+_cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+
+def _text_surface(
+    content: str,
+    font: pygame.font.Font,
+    color: Color,
+    bg_color: Optional[Color],
+    shadowed: bool,
+) -> pygame.Surface:
+    key = (content, font, color, bg_color, shadowed)
+    surface = _cache.get(key)
+
+    if surface is not None:
+        _cache.move_to_end(key)
+        return surface
+
+    # The text is rendered by gale once, in a surface with a margin
+    width, height = font.size(content)
+    surface = pygame.Surface(
+        (width + 2 * MARGIN, height + 2 * MARGIN), pygame.SRCALPHA
+    )
+    text.render_text(
+        surface,
+        content,
+        font,
+        MARGIN,
+        MARGIN,
+        color,
+        bg_color,
+        shadowed=shadowed,
+    )
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+
+    _cache[key] = surface
+    if len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+    return surface
+
+
+def render_text(
+    surface: pygame.Surface,
+    content: str,
+    font: pygame.font.Font,
+    x: int,
+    y: int,
+    color: Color,
+    bg_color: Optional[Color] = None,
+    center: bool = False,
+    shadowed: bool = False,
+) -> None:
+    if center:
+        width, height = font.size(content)
+        x -= width // 2
+        y -= height // 2
+
+    surface.blit(
+        _text_surface(content, font, color, bg_color, shadowed),
+        (x - MARGIN, y - MARGIN),
+    )